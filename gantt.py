@@ -1,3 +1,4 @@
+import math
 import re
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
@@ -5,6 +6,7 @@ import matplotlib.dates as mdates
 import matplotlib.ticker as mticker
 from matplotlib.gridspec import GridSpec
 from matplotlib.patches import Rectangle, Polygon
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
 from matplotlib.dates import MonthLocator, DateFormatter, WeekdayLocator, MO
 from matplotlib.backends.backend_pdf import PdfPages
 
@@ -17,11 +19,16 @@ MAX_ROWS_PER_PAGE = 35
 PRIMARY = "#991f2b"
 SECONDARY = "black"
 LEFT_RIGHT_WIDTHS = [1.6, 2.4]
+TABLE_WIDTH_FRACTION = LEFT_RIGHT_WIDTHS[0] / sum(LEFT_RIGHT_WIDTHS)
+CHART_WIDTH_FRACTION = LEFT_RIGHT_WIDTHS[1] / sum(LEFT_RIGHT_WIDTHS)
 COL_EDGES = [0.00, 0.65, 0.75, 0.87, 1.00]
 HEADERS = ["Task", "Duration", "Start", "Finish"]
 MAX_NAME_LENGTH = 50
 ROW_HEIGHT = 1.0
 MIN_WIDTH_DAYS = 0.2
+NEWLINES_TO_SPACES = str.maketrans({"\n": " ", "\r": " "})
+# Text.set_bbox copies its argument, so one dict serves every tick label
+TICK_LABEL_BBOX = dict(boxstyle="round,pad=0.3", facecolor="white", edgecolor=SECONDARY, linewidth=0.8)
 
 # Replace all the current Gantt functions with these from testgantt.py:
 
@@ -60,11 +67,11 @@ def _parse_dt(s):
         except ValueError:
             return None
 
-def compute_duration_days(start, finish):
-    """Integer calendar-day span; same-day shows as 0."""
-    if not start or not finish:
+def compute_duration_days(start_num, finish_num):
+    """Integer calendar-day span between two date2num values; same-day shows as 0."""
+    if start_num is None or finish_num is None:
         return None
-    return max(0, (finish.date() - start.date()).days)
+    return max(0, math.floor(finish_num) - math.floor(start_num))
 
 def estimate_text_width_in_days(text, fontsize, chart_span_days, chart_width_inches):
     """
@@ -83,15 +90,20 @@ def estimate_text_width_in_days(text, fontsize, chart_span_days, chart_width_inc
     # Keep 10% safety margin for readability
     return text_width_days * 1.1
 
-def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x_max, true_start, 
-                    total_span_days, chart_width_inches, title, project_title, customer_name, logo_path, version="V1"):
-    """Renders a single page of the Gantt chart with version info."""
+def _build_one_page_with_version(pdf, fig, page_rows, page_num, total_pages, x_min, x_max,
+                    x_min_num, x_max_num, true_start_num, total_span_days, chart_width_inches, title, project_title, customer_name, logo_img, version="V1",
+                    page_bbox=None):
+    """
+    Renders a single page of the Gantt chart with version info.
+    Returns the crop box used, to be passed back as page_bbox for the next page.
+    """
     header_row = {
         "name": "Task", "start": None, "finish": None, "kind": "header", "dur": "Duration"
     }
     all_rows_for_page = [header_row] + page_rows
 
-    fig = plt.figure(figsize=(16, 10))
+    # One figure is reused for every page; start each page from a blank canvas
+    fig.clear()
 
     # Manual Axes Creation for Fixed Row Height
     left_margin, right_margin, bottom_margin, top_margin = 0.03, 0.99, 0.10, 0.88
@@ -102,8 +114,8 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
     height_ratio = rows_on_this_page / rows_on_full_page
     current_plot_h = full_plot_area_h * height_ratio
     current_bottom = top_margin - current_plot_h
-    table_w = plot_area_w * (LEFT_RIGHT_WIDTHS[0] / sum(LEFT_RIGHT_WIDTHS))
-    chart_w = plot_area_w * (LEFT_RIGHT_WIDTHS[1] / sum(LEFT_RIGHT_WIDTHS))
+    table_w = plot_area_w * TABLE_WIDTH_FRACTION
+    chart_w = plot_area_w * CHART_WIDTH_FRACTION
     table_l, chart_l = left_margin, left_margin + table_w
     ax_left = fig.add_axes([table_l, current_bottom, table_w, current_plot_h])
     ax_right = fig.add_axes([chart_l, current_bottom, chart_w, current_plot_h])
@@ -115,48 +127,53 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
     ax_left.invert_yaxis()
     ax_left.axis("off")
 
+    # Table cells are collected and added as a single PatchCollection below
+    cells, cell_faces, cell_widths = [], [], []
     for idx, r in enumerate(all_rows_for_page):
         is_header_row = r["kind"] == "header"
         is_summary_row = r["kind"] == "summary"
         for c in range(4):
             x0 = COL_EDGES[c]
             w = COL_EDGES[c + 1] - COL_EDGES[c]
+            cells.append(Rectangle((x0, idx - 0.5), w, 1.0))
             if is_header_row or is_summary_row:
-                ax_left.add_patch(Rectangle((x0, idx - 0.5), w, 1.0, facecolor=PRIMARY, 
-                                            edgecolor=SECONDARY, linewidth=1.2 if is_header_row else 0.6))
+                cell_faces.append(PRIMARY)
+                cell_widths.append(1.2 if is_header_row else 0.6)
             else:
-                ax_left.add_patch(Rectangle((x0, idx - 0.5), w, 1.0, fill=False, 
-                                            edgecolor=SECONDARY, linewidth=0.6))
+                cell_faces.append("none")
+                cell_widths.append(0.6)
         if is_header_row:
             for c, header_text in enumerate(HEADERS):
                 center_x = (COL_EDGES[c] + COL_EDGES[c + 1]) / 2
                 ax_left.text(center_x, idx, header_text, va="center", ha="center", 
                              fontsize=FONTSIZE_TABLE, fontweight="bold", color="white")
         else:
-            name_text = r["name"].replace('\n', ' ').replace('\r', ' ')
-            if len(name_text) > MAX_NAME_LENGTH:
-                name_text = name_text[:MAX_NAME_LENGTH-3] + "..."
+            name_text = r["name_display"]
             text_color = "white" if is_summary_row else SECONDARY
             font_weight = "bold" if is_summary_row else "normal"
             ax_left.text(COL_EDGES[0] + 0.008, idx, name_text, va="center", ha="left", 
                          fontsize=FONTSIZE_TABLE, fontweight=font_weight, color=text_color)
             ax_left.text((COL_EDGES[1] + COL_EDGES[2]) / 2, idx, 
-                         ("" if r["dur"] is None else f"{r['dur']}d"), 
+                         r["dur_str"], 
                          va="center", ha="center", fontsize=FONTSIZE_TABLE, color=text_color)
             if r["start"]:
                 ax_left.text((COL_EDGES[2] + COL_EDGES[3]) / 2, idx, 
-                             r["start"].strftime("%m/%d/%y"), va="center", ha="center", fontsize=FONTSIZE_TABLE, color=text_color)
+                             r["start_str"], va="center", ha="center", fontsize=FONTSIZE_TABLE, color=text_color)
             if r["finish"]:
                 ax_left.text((COL_EDGES[3] + COL_EDGES[4]) / 2, idx, 
-                             r["finish"].strftime("%m/%d/%y"), va="center", ha="center", fontsize=FONTSIZE_TABLE, color=text_color)
-    
-    ax_left.axhline(y=-0.5, linestyle="-", linewidth=2.0, color=SECONDARY)
-    ax_left.axhline(y=len(all_rows_for_page) - 0.5, linestyle="-", linewidth=2.0, color=SECONDARY)
-    ax_left.axvline(x=0, linestyle="-", linewidth=2.0, color=SECONDARY)
+                             r["finish_str"], va="center", ha="center", fontsize=FONTSIZE_TABLE, color=text_color)
+    ax_left.add_collection(PatchCollection(cells, facecolors=cell_faces, edgecolors=SECONDARY,
+                                           linewidths=cell_widths, joinstyle="miter"), autolim=False)
+
+    # Heavy frame lines (top, bottom, left) as one collection
+    frame_top, frame_bottom = -0.5, len(all_rows_for_page) - 0.5
+    ax_left.add_collection(LineCollection(
+        [[(0, frame_top), (1, frame_top)], [(0, frame_bottom), (1, frame_bottom)], [(0, frame_top), (0, frame_bottom)]],
+        colors=SECONDARY, linewidths=2.0, capstyle="projecting"), autolim=False)
 
     # RIGHT: chart
-    chart_right_edge = mdates.date2num(x_max)
-    ax_right.set_xlim(mdates.date2num(x_min), chart_right_edge)
+    chart_left_edge, chart_right_edge = x_min_num, x_max_num
+    ax_right.set_xlim(chart_left_edge, chart_right_edge)
     ax_right.xaxis.tick_top()
     ax_right.xaxis.set_label_position('top')
     project_duration_months = (x_max.year - x_min.year) * 12 + (x_max.month - x_min.month)
@@ -165,22 +182,31 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
     ax_right.xaxis.set_minor_locator(mticker.NullLocator())
     ax_right.tick_params(axis='x', which='major', labelsize=FONTSIZE_XTICK, pad=2)
     for label in ax_right.get_xticklabels():
-        label.set_bbox(dict(boxstyle="round,pad=0.3", facecolor="white", edgecolor=SECONDARY, linewidth=0.8))
+        label.set_bbox(TICK_LABEL_BBOX)
     ax_right.grid(which="major", axis="x", linestyle="--", linewidth=0.8, color=SECONDARY, alpha=0.6)
-    for y in range(len(all_rows_for_page) + 1):
-        ax_right.axhline(y=y - 0.5, linestyle="--", linewidth=0.6, color=SECONDARY, alpha=0.5)
-    ax_right.axhline(y=-0.5, linestyle="-", linewidth=2.0, color=SECONDARY)
-    ax_right.axhline(y=len(all_rows_for_page) - 0.5, linestyle="-", linewidth=2.0, color=SECONDARY)
-    ax_right.axvline(x=chart_right_edge, linestyle="-", linewidth=2.0, color=SECONDARY)
+    # Dashed row separators, then the heavy frame (top, bottom, right), one collection each
+    ax_right.add_collection(LineCollection(
+        [[(chart_left_edge, y - 0.5), (chart_right_edge, y - 0.5)] for y in range(len(all_rows_for_page) + 1)],
+        colors=SECONDARY, linewidths=0.6, linestyles="--", alpha=0.5), autolim=False)
+    ax_right.add_collection(LineCollection(
+        [[(chart_left_edge, frame_top), (chart_right_edge, frame_top)],
+         [(chart_left_edge, frame_bottom), (chart_right_edge, frame_bottom)],
+         [(chart_right_edge, frame_top), (chart_right_edge, frame_bottom)]],
+        colors=SECONDARY, linewidths=2.0, capstyle="projecting"), autolim=False)
     ax_right.set_yticks([])
     ax_right.tick_params(axis='y', which='both', length=0)
-    chart_left_edge = mdates.date2num(x_min)
     
+    # Bars, diamonds and summary caps are collected per row and drawn as one
+    # collection each after the loop; only the labels are added as they go
+    task_bars, summary_bars, diamonds, summary_caps = [], [], [], []
+    # The width estimate is linear in the label length, so measure one character per font size
+    regular_days_per_char = estimate_text_width_in_days("x", FONTSIZE_CHART_REGULAR, total_span_days, chart_width_inches)
+    summary_days_per_char = estimate_text_width_in_days("x", FONTSIZE_CHART_SUMMARY, total_span_days, chart_width_inches)
     for idx, r in enumerate(all_rows_for_page):
         if idx == 0: continue
             
         if r["kind"] != "summary" and r["start"] and r["finish"]:
-            start_num, finish_num = mdates.date2num(r["start"]), mdates.date2num(r["finish"])
+            start_num, finish_num = r["start_num"], r["finish_num"]
             is_milestone = (finish_num - start_num) < 0.01
             
             if is_milestone:
@@ -188,19 +214,18 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
                 diamond_width_days = max(3, total_span_days * 0.005) 
                 diamond_x, diamond_y = start_num, idx
                 diamond_verts = [(diamond_x, diamond_y + diamond_height), (diamond_x + diamond_width_days, diamond_y), (diamond_x, diamond_y - diamond_height), (diamond_x - diamond_width_days, diamond_y), (diamond_x, diamond_y + diamond_height)]
-                diamond = plt.Polygon(diamond_verts, facecolor=PRIMARY, edgecolor=SECONDARY, linewidth=1.5)
-                ax_right.add_patch(diamond)
-                name_text = r["name"].replace('\n', ' ').replace('\r', ' ')
-                text_width_days = estimate_text_width_in_days(name_text, FONTSIZE_CHART_SUMMARY, total_span_days, chart_width_inches)
+                diamonds.append(diamond_verts)
+                name_text = r["name_clean"]
+                text_width_days = len(name_text) * summary_days_per_char
                 text_start_x = diamond_x + diamond_width_days + (total_span_days * 0.005)
                 if chart_right_edge - text_start_x > text_width_days:
                     ax_right.text(text_start_x, diamond_y, name_text, va="center", ha="left", fontsize=FONTSIZE_CHART_SUMMARY, color=SECONDARY)
             else:
                 span = max(finish_num - start_num, MIN_WIDTH_DAYS)
                 bar_height, bar_y = 0.5, idx - 0.25
-                ax_right.broken_barh([(start_num, span)], (bar_y, bar_height), facecolors=PRIMARY, edgecolors=SECONDARY, linewidth=0.8)
-                name_text = r["name"].replace('\n', ' ').replace('\r', ' ')
-                text_width_days = estimate_text_width_in_days(name_text, FONTSIZE_CHART_REGULAR, total_span_days, chart_width_inches)
+                task_bars.append(Rectangle((start_num, bar_y), span, bar_height))
+                name_text = r["name_clean"]
+                text_width_days = len(name_text) * regular_days_per_char
                 margin_days = max(1.5, total_span_days * 0.015)
                 space_on_right = chart_right_edge - finish_num - margin_days
                 space_on_left = start_num - chart_left_edge - margin_days
@@ -209,23 +234,23 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
                 elif space_on_left >= text_width_days:
                     ax_right.text(start_num - margin_days, idx, name_text, va="center", ha="right", fontsize=FONTSIZE_CHART_REGULAR, color=SECONDARY)
         elif r["kind"] == "summary" and r["start"] and r["finish"]:
-            start_num, finish_num = mdates.date2num(r["start"]), mdates.date2num(r["finish"])
+            start_num, finish_num = r["start_num"], r["finish_num"]
             span = max(finish_num - start_num, MIN_WIDTH_DAYS)
             bar_height, bar_y, cap_height = 0.1, idx - 0.05, 0.4
-            name_text = r["name"].replace('\n', ' ').replace('\r', ' ')
-            text_width_days = estimate_text_width_in_days(name_text, FONTSIZE_CHART_SUMMARY, total_span_days, chart_width_inches)
+            name_text = r["name_clean"]
+            text_width_days = len(name_text) * summary_days_per_char
             margin_days = max(1.5, total_span_days * 0.015)
             space_on_right = chart_right_edge - (start_num + span) - margin_days
             space_on_left = start_num - chart_left_edge - margin_days
             if space_on_right >= text_width_days:
-                ax_right.broken_barh([(start_num, span)], (bar_y, bar_height), facecolors=SECONDARY, edgecolors=SECONDARY, linewidth=1.0)
-                ax_right.plot([start_num, start_num], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
-                ax_right.plot([start_num + span, start_num + span], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
+                summary_bars.append(Rectangle((start_num, bar_y), span, bar_height))
+                summary_caps.append([(start_num, idx - cap_height/2), (start_num, idx + cap_height/2)])
+                summary_caps.append([(start_num + span, idx - cap_height/2), (start_num + span, idx + cap_height/2)])
                 ax_right.text(start_num + span + margin_days, idx, name_text, va="center", ha="left", fontsize=FONTSIZE_CHART_SUMMARY, color=SECONDARY)
             elif space_on_left >= text_width_days:
-                ax_right.broken_barh([(start_num, span)], (bar_y, bar_height), facecolors=SECONDARY, edgecolors=SECONDARY, linewidth=1.0)
-                ax_right.plot([start_num, start_num], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
-                ax_right.plot([start_num + span, start_num + span], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
+                summary_bars.append(Rectangle((start_num, bar_y), span, bar_height))
+                summary_caps.append([(start_num, idx - cap_height/2), (start_num, idx + cap_height/2)])
+                summary_caps.append([(start_num + span, idx - cap_height/2), (start_num + span, idx + cap_height/2)])
                 ax_right.text(start_num - margin_days, idx, name_text, va="center", ha="right", fontsize=FONTSIZE_CHART_SUMMARY, color=SECONDARY)
             else:
                 bar_center = start_num + span / 2
@@ -234,14 +259,19 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
                 right_split_start = bar_center + text_space_needed / 2
                 min_segment_width = max(0.5, total_span_days * 0.005)
                 if left_split_end > start_num and (left_split_end - start_num) >= min_segment_width:
-                    ax_right.broken_barh([(start_num, left_split_end - start_num)], (bar_y, bar_height), facecolors=SECONDARY, edgecolors=SECONDARY, linewidth=1.0)
-                    ax_right.plot([start_num, start_num], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
+                    summary_bars.append(Rectangle((start_num, bar_y), left_split_end - start_num, bar_height))
+                    summary_caps.append([(start_num, idx - cap_height/2), (start_num, idx + cap_height/2)])
                 if right_split_start < start_num + span and ((start_num + span) - right_split_start) >= min_segment_width:
-                    ax_right.broken_barh([(right_split_start, (start_num + span) - right_split_start)], (bar_y, bar_height), facecolors=SECONDARY, edgecolors=SECONDARY, linewidth=1.0)
-                    ax_right.plot([start_num + span, start_num + span], [idx - cap_height/2, idx + cap_height/2], color=SECONDARY, linewidth=2)
+                    summary_bars.append(Rectangle((right_split_start, bar_y), (start_num + span) - right_split_start, bar_height))
+                    summary_caps.append([(start_num + span, idx - cap_height/2), (start_num + span, idx + cap_height/2)])
                 ax_right.text(bar_center, idx, name_text, va="center", ha="center", fontsize=FONTSIZE_CHART_SUMMARY, color=SECONDARY)
 
-    ax_right.axvline(mdates.date2num(true_start), linestyle="--", linewidth=1.0, color=SECONDARY, alpha=0.4)
+    ax_right.add_collection(PatchCollection(task_bars, facecolors=PRIMARY, edgecolors=SECONDARY, linewidths=0.8, joinstyle="miter"), autolim=False)
+    ax_right.add_collection(PatchCollection(summary_bars, facecolors=SECONDARY, edgecolors=SECONDARY, linewidths=1.0, joinstyle="miter"), autolim=False)
+    ax_right.add_collection(PolyCollection(diamonds, facecolors=PRIMARY, edgecolors=SECONDARY, linewidths=1.5, joinstyle="miter"), autolim=False)
+    ax_right.add_collection(LineCollection(summary_caps, colors=SECONDARY, linewidths=2, capstyle="projecting"), autolim=False)
+
+    ax_right.axvline(true_start_num, linestyle="--", linewidth=1.0, color=SECONDARY, alpha=0.4)
     fig.text(0.5, 0.96, title, ha='center', va='bottom', fontsize=16, fontweight='bold', color=PRIMARY)
     info_y_start = 0.98
     if project_title:
@@ -249,9 +279,8 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
     if customer_name:
         customer_y = info_y_start - 0.025 if project_title else info_y_start
         fig.text(0.03, customer_y, f"Customer: {customer_name}", ha='left', va='top', fontsize=11, color=PRIMARY)
-    if logo_path:
+    if logo_img is not None:
         try:
-            logo_img = plt.imread(logo_path)
             logo_height_fig, right_edge, top_edge = 0.06, 0.99, 0.98
             aspect_ratio = logo_img.shape[1] / logo_img.shape[0]
             fig_width_in, fig_height_in = fig.get_size_inches()
@@ -264,7 +293,7 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
             ax_logo.imshow(logo_img)
             ax_logo.axis('off')
         except Exception as e:
-            print(f"Warning: Could not load or place logo. Error: {e}")
+            print(f"Warning: Could not place logo. Error: {e}")
     if total_pages > 1:
         fig.text(0.99, 0.01, f'Page {page_num} of {total_pages}', ha='right', va='bottom', fontsize=7, color='gray')
 
@@ -272,8 +301,12 @@ def _build_one_page_with_version(pdf, page_rows, page_num, total_pages, x_min, x
     date_str = datetime.now().strftime("%B %d, %Y")
     fig.text(0.03, 0.02, f"{date_str} - {version}", ha='left', va='bottom', fontsize=8, color='gray')
 
-    pdf.savefig(fig, bbox_inches="tight")
-    plt.close(fig)
+    if page_bbox is None:
+        # Same crop as bbox_inches="tight"; the header, footer and axis are
+        # identical on every page, so later pages reuse it and skip that layout pass
+        page_bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams["savefig.pad_inches"])
+    pdf.savefig(fig, bbox_inches=page_bbox)
+    return page_bbox
 
 
 def build_gantt_with_version(rows, out_pdf, title="Project Schedule", project_title="", customer_name="", logo_path="", version="V1"):
@@ -296,20 +329,51 @@ def build_gantt_with_version(rows, out_pdf, title="Project Schedule", project_ti
     x_max = true_finish + timedelta(days=right_pad_days)
     total_span_days = (x_max.date() - x_min.date()).days
     
+    # Per-row values every page needs, converted once up front; date2num
+    # takes each date column in a single call
+    for key in ("start", "finish"):
+        for r in rows:
+            r[f"{key}_num"] = None
+            r[f"{key}_str"] = r[key].strftime("%m/%d/%y") if r[key] else ""
+        dated = [r for r in rows if r[key]]
+        for r, num in zip(dated, mdates.date2num([r[key] for r in dated]).tolist()):
+            r[f"{key}_num"] = num
     for r in rows:
-        r["dur"] = compute_duration_days(r["start"], r["finish"])
+        r["dur"] = compute_duration_days(r["start_num"], r["finish_num"])
+        r["dur_str"] = "" if r["dur"] is None else f"{r['dur']}d"
+        r["name_clean"] = r["name"].translate(NEWLINES_TO_SPACES)
+        r["name_display"] = (r["name_clean"] if len(r["name_clean"]) <= MAX_NAME_LENGTH
+                             else r["name_clean"][:MAX_NAME_LENGTH-3] + "...")
 
-    with PdfPages(out_pdf) as pdf:
-        total_pages = (len(rows) + MAX_ROWS_PER_PAGE - 1) // MAX_ROWS_PER_PAGE
-        chart_width_inches = 16 * LEFT_RIGHT_WIDTHS[1] / sum(LEFT_RIGHT_WIDTHS)
+    x_min_num, x_max_num = mdates.date2num(x_min), mdates.date2num(x_max)
+    true_start_num = mdates.date2num(true_start)
+
+    # Decode the logo once; every page reuses the same pixel array
+    logo_img = None
+    if logo_path:
+        try:
+            logo_img = plt.imread(logo_path)
+        except Exception as e:
+            print(f"Warning: Could not load logo. Error: {e}")
+
+    fig = plt.figure(figsize=(16, 10))
+    try:
+        with PdfPages(out_pdf) as pdf:
+            total_pages = (len(rows) + MAX_ROWS_PER_PAGE - 1) // MAX_ROWS_PER_PAGE
+            chart_width_inches = 16 * CHART_WIDTH_FRACTION
 
-        for i in range(0, len(rows), MAX_ROWS_PER_PAGE):
-            page_rows_chunk = rows[i : i + MAX_ROWS_PER_PAGE]
-            page_num = (i // MAX_ROWS_PER_PAGE) + 1
-            print(f"Generating page {page_num} of {total_pages}...")
-            _build_one_page_with_version(
-                pdf=pdf, page_rows=page_rows_chunk, page_num=page_num, total_pages=total_pages,
-                x_min=x_min, x_max=x_max, true_start=true_start, total_span_days=total_span_days,
-                chart_width_inches=chart_width_inches, title=title, project_title=project_title,
-                customer_name=customer_name, logo_path=logo_path, version=version
-            )
+            page_bbox = None
+            for i in range(0, len(rows), MAX_ROWS_PER_PAGE):
+                page_rows_chunk = rows[i : i + MAX_ROWS_PER_PAGE]
+                page_num = (i // MAX_ROWS_PER_PAGE) + 1
+                print(f"Generating page {page_num} of {total_pages}...")
+                page_bbox = _build_one_page_with_version(
+                    pdf=pdf, fig=fig, page_rows=page_rows_chunk, page_num=page_num, total_pages=total_pages,
+                    x_min=x_min, x_max=x_max, x_min_num=x_min_num, x_max_num=x_max_num,
+                    true_start_num=true_start_num, total_span_days=total_span_days,
+                    chart_width_inches=chart_width_inches, title=title, project_title=project_title,
+                    customer_name=customer_name, logo_img=logo_img, version=version,
+                    page_bbox=page_bbox
+                )
+    finally:
+        plt.close(fig)
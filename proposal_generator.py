@@ -1,7 +1,12 @@
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
+from contextlib import contextmanager
+from collections import deque
 from datetime import datetime, date, timedelta
 import holidays
-import PyPDF2
+try:
+    from pypdf import PdfWriter  # maintained successor of PyPDF2
+except ImportError:
+    from PyPDF2 import PdfWriter
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import json
@@ -23,12 +28,20 @@ from functools import partial
 from reportlab.platypus import SimpleDocTemplate
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, black, gray, lightgrey, white
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 import os
 import sys
 import csv
 import io
 import re
 import math
+import queue
+import threading
 from io import BytesIO
 
 try:
@@ -37,11 +50,329 @@ try:
 except ImportError:
     HAS_TKCAL = False
 
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the scheduling kernels stay importable without numba."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# numba's on-disk cache needs the .py source next to the module, which a
+# PyInstaller bundle lacks; decorating with cache=True there raises at import
+NUMBA_CACHE = not getattr(sys, "frozen", False)
+
 from utils import resource_path
 from gantt import build_gantt_with_version
+
+# Column order for the template "Tasks" sheet (and its JSON cache)
+TEMPLATE_TASK_HEADERS = [
+    "ID", "Name", "Duration", "Price", "Is Milestone", "Indent Level",
+    "Enabled", "Predecessor ID", "Lag", "Is Start Pinned", "Parent ID"
+]
+# Column dtypes for the same sheet
+TEMPLATE_TASK_DTYPES = {
+    "ID": "Int64", "Duration": "Float64", "Price": "Float64",
+    "Is Milestone": "boolean", "Indent Level": "Int64", "Enabled": "boolean",
+    "Predecessor ID": "Int64", "Lag": "Float64", "Is Start Pinned": "boolean",
+    "Parent ID": "Int64",
+}
+TEMPLATE_CACHE_SUFFIX = ".cache.json"
+
+# MSPDI namespace and element names, in the order they are written
+MSP_NS = "http://schemas.microsoft.com/project"
+MSP_PROJECT_TAGS = (
+    "Name", "CreationDate", "LastSaved", "ScheduleFromStart", "CalendarUID",
+    "DefaultStartTime", "DefaultFinishTime",
+    "MinutesPerDay", "MinutesPerWeek", "DaysPerMonth",
+)
+MSP_CALENDAR_TAGS = ("UID", "Name", "IsBaseCalendar", "BaseCalendarUID")
+MSP_TASK_TAGS = (
+    "UID", "ID", "Name", "Type", "IsNull", "CreateDate",
+    "WBS", "OutlineNumber", "OutlineLevel",
+    "Start", "Finish", "Duration", "DurationFormat",
+    "Summary", "Milestone", "Active", "Manual",
+)
+MSP_LINK_TAGS = ("PredecessorUID", "Type", "CrossProject", "LinkLag", "LagFormat")
+
+# Export row kinds, indexed by ProposalItem.kind
+ROW_KINDS = ("Summary", "Milestone", "Task")
+
+# Default proposal template, frozen once as (name, duration, price, is_milestone,
+# indent_level) rows in outline order; create_template_structure builds items from it
+DEFAULT_TEMPLATE_ROWS = (
+    # Project Initiation
+    ("Project Initiation", 0, 0, True, 0),
+    ("Deposit & Contract Signed", 0, 0, False, 1),
+    ("Notice to Proceed", 0, 0, False, 1),
+    ("Civil Start - Civil Due Diligence", 1, 0, False, 1),
+    ("Electrical Start - Electrical Due Diligence", 1, 0, False, 1),
+    # Civil Engineering
+    ("Civil Engineering", 0, 0, True, 0),
+    ("30% Design", 0, 0, True, 1),
+    ("30% - Planset/ Basis of Design", 20, 20000, False, 2),
+    ("Pre-Development Hydrology Study", 10, 10000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("60% Design", 0, 0, True, 1),
+    ("60% - Planset", 25, 110000, False, 2),
+    ("Stormwater Pollution Prevention Plan", 10, 6000, False, 2),
+    ("Post-Development Hydrology Study", 10, 15000, False, 2),
+    ("Stormwater Management Report", 15, 12000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("90% Design", 0, 0, True, 1),
+    ("90% - Planset", 5, 35000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("IFC Design", 0, 0, True, 1),
+    ("IFC - Planset", 15, 56500, False, 2),
+    ("Studies Updates", 5, 6500, True, 1),
+    ("Stormwater Pollution Prevention Plan", 5, 1000, False, 2),
+    ("Post-Development Hydrology Study", 5, 2500, False, 2),
+    ("Stormwater Management Report", 5, 3000, False, 2),
+    # Electrical Engineering
+    ("Electrical Engineering", 0, 0, True, 0),
+    ("30% Design", 0, 0, True, 1),
+    ("30% - Planset/Basis of Design", 11, 40000, False, 2),
+    ("Reactive Power Study", 6, 18500, False, 2),
+    ("MV - Short Circuit Study", 5, 6500, False, 2),
+    ("SAM Model", 3, 5000, False, 2),
+    ("PV SYST", 3, 5000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("60% Design", 0, 0, True, 1),
+    ("60% - Planset", 14, 80000, False, 2),
+    ("DC - Short Circuit Study", 3, 6500, False, 2),
+    ("Under Ground Cable Thermal Study", 8, 10000, False, 2),
+    ("Grounding Study", 8, 13000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("90% Design", 0, 0, True, 1),
+    ("90% - Planset", 13, 63500, False, 2),
+    ("Load Flow Study", 2, 13000, False, 2),
+    ("Coordination Study", 2, 9500, False, 2),
+    ("Arc Flash Study", 5, 13000, False, 2),
+    ("Client Review", 10, 0, False, 2),
+    ("IFC Design", 0, 0, True, 1),
+    ("IFC - Planset", 10, 13000, False, 2),
+    # Structural Engineering
+    ("Structural Engineering", 0, 0, True, 0),
+    ("Structural Engineering (Except racking foundation design)", 10, 25000, False, 1),
+    # Project Closeout
+    ("Project Closeout", 0, 0, True, 0),
+)
+
+# Predecessor type codes for the array-based scheduler
+PRED_TYPE_CODES = {"FS": 0, "SS": 1, "FF": 2, "SF": 3}
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+NO_DATE = np.iinfo(np.int64).min  # int64 view of NaT
+BUSINESS_HORIZON_DAYS = 5 * 365  # minimum span of the cached business-day bitmap
+START_CHANGE_DELAY_MS = 250  # debounce for project start date edits
+BG_POLL_MS = 100  # how often the UI checks for a finished background job
+TREE_INDENTS = tuple("  " * i for i in range(32))  # name prefixes by indent level
+PDF_INDENTS = tuple("&nbsp;" * 4 * i for i in range(32))  # same, for the PDF table
+
+
+@njit(cache=NUMBA_CACHE)
+def _is_business_day(day, business, base):
+    """Look a day (days since epoch) up in the bitmap; outside it, only weekends are off."""
+    k = day - base
+    if 0 <= k < business.shape[0]:
+        return business[k]
+    return (day + 3) % 7 < 5  # 1970-01-01 was a Thursday
+
+
+@njit(cache=NUMBA_CACHE)
+def _business_steps(n):
+    """Business days _add_business_days moves for n; the start day counts as day one."""
+    return n - 1 if n > 0 else n
+
+
+@njit(cache=NUMBA_CACHE)
+def _offset_business_days(day, steps, business, base):
+    """Roll day forward onto a business day, then move steps business days."""
+    if day == NO_DATE:
+        return NO_DATE
+    while not _is_business_day(day, business, base):
+        day += 1
+    remaining = steps
+    step = 1 if remaining >= 0 else -1
+    remaining = abs(remaining)
+    while remaining > 0:
+        day += step
+        if _is_business_day(day, business, base):
+            remaining -= 1
+    return day
+
+
+@njit(cache=NUMBA_CACHE)
+def _shift_business_days(day, n, business, base):
+    """Kernel form of _add_business_days on days since epoch."""
+    return _offset_business_days(day, _business_steps(n), business, base)
+
+
+@njit(cache=NUMBA_CACHE)
+def _propagate(start_days, end_days, durations, pred_pos, pred_types, lags, pinned,
+               from_project_start, project_start, business, base):
+    """
+    Propagate start/end days (int64 days since epoch, NO_DATE when unset)
+    through tasks in topological order. pred_types holds PRED_TYPE_CODES.
+    """
+    for i in range(start_days.shape[0]):
+        if not pinned[i]:
+            p = pred_pos[i]
+            if p >= 0 and end_days[p] != NO_DATE:
+                code = pred_types[i]
+                if code == 0:    # FS
+                    start = _shift_business_days(end_days[p], lags[i] + 1, business, base)
+                elif code == 1:  # SS
+                    start = _shift_business_days(start_days[p], lags[i], business, base)
+                elif code == 2 or code == 3:  # FF / SF
+                    # Finish at anchor + lag, start back from it; once on a
+                    # business day the two moves add, so take them in one walk
+                    anchor = end_days[p] if code == 2 else start_days[p]
+                    steps = _business_steps(lags[i]) + _business_steps(1 - durations[i])
+                    start = _offset_business_days(anchor, steps, business, base)
+                else:
+                    start = NO_DATE
+            else:
+                start = project_start
+                from_project_start[i] = True
+            start_days[i] = start
+        end_days[i] = _shift_business_days(start_days[i], durations[i], business, base)
+
+
+def _propagate_by_level(starts, ends, durations, pred_pos, depth, pred_types, lags, pinned,
+                        from_project_start, project_start, calendar):
+    """
+    NumPy counterpart of _propagate for when numba is unavailable. Each task
+    has at most one predecessor, so tasks at the same depth are independent
+    and are shifted together with np.busday_offset (datetime64[D] arrays).
+    """
+    nat = np.datetime64("NaT", "D")
+
+    def steps(offsets):
+        # Same convention as _add_business_days: n-1 business days for
+        # positive n and n days otherwise
+        return np.where(offsets > 0, offsets - 1, offsets)
+
+    def offset(days, business_steps):
+        return np.busday_offset(days, business_steps, roll="forward", busdaycal=calendar)
+
+    def shift(days, offsets):
+        return offset(days, steps(offsets))
+
+    for level in range(int(depth.max()) + 1):
+        idx = np.flatnonzero(depth == level)
+        free = idx[~pinned[idx]]
+        if free.size:
+            preds = pred_pos[free]
+            pred_end = np.where(preds >= 0, ends[np.maximum(preds, 0)], nat)
+            pred_start = starts[np.maximum(preds, 0)]
+            linked = ~np.isnat(pred_end)
+
+            # Unlinked tasks (no enabled predecessor with an end date) start with the project
+            unlinked = free[~linked]
+            starts[unlinked] = project_start
+            from_project_start[unlinked] = True
+
+            lf = free[linked]
+            codes, lag, dur = pred_types[lf], lags[lf], durations[lf]
+            p_end, p_start = pred_end[linked], pred_start[linked]
+            fs, ss = codes == PRED_TYPE_CODES["FS"], codes == PRED_TYPE_CODES["SS"]
+            ff, sf = codes == PRED_TYPE_CODES["FF"], codes == PRED_TYPE_CODES["SF"]
+            new_start = np.full(lf.size, nat)
+            new_start[fs] = shift(p_end[fs], lag[fs] + 1)
+            new_start[ss] = shift(p_start[ss], lag[ss])
+            # FF/SF: finish at anchor + lag, then back up; one offset covers both moves
+            new_start[ff] = offset(p_end[ff], steps(lag[ff]) + steps(1 - dur[ff]))
+            new_start[sf] = offset(p_start[sf], steps(lag[sf]) + steps(1 - dur[sf]))
+            starts[lf] = new_start
+        ends[idx] = shift(starts[idx], durations[idx])
+
+
+def _write_mspdi_document(element, leaves, project_values, task_records):
+    """Emit the MSPDI structure through a streaming writer's element/leaves callables."""
+    with element("Project", MSP_NS):
+        # Basic project meta, default times/units (common MSPDI defaults)
+        leaves(MSP_PROJECT_TAGS, project_values)
+        # Calendars (Standard)
+        with element("Calendars"), element("Calendar"):
+            leaves(MSP_CALENDAR_TAGS, ("1", "Standard", "1", "0"))
+        with element("Tasks"):
+            for task_values, link_values in task_records:
+                with element("Task"):
+                    leaves(MSP_TASK_TAGS, task_values)
+                    if link_values:
+                        with element("PredecessorLink"):
+                            leaves(MSP_LINK_TAGS, link_values)
+
+
+def _write_mspdi_lxml(filename, project_values, task_records):
+    """Stream MSPDI XML with lxml's C incremental writer."""
+    qualified = {}
+
+    def qname(tag):
+        name = qualified.get(tag)
+        if name is None:
+            name = qualified[tag] = f"{{{MSP_NS}}}{tag}"
+        return name
+
+    with etree.xmlfile(filename, encoding="utf-8") as xf:
+        xf.write_declaration()
+
+        def element(tag, default_ns=None):
+            if default_ns:
+                return xf.element(qname(tag), nsmap={None: default_ns})
+            return xf.element(qname(tag))
+
+        def leaves(tags, values):
+            for tag, text in zip(tags, values):
+                with xf.element(qname(tag)):
+                    xf.write(text)
+
+        _write_mspdi_document(element, leaves, project_values, task_records)
+
+
+def _write_mspdi_sax(filename, project_values, task_records):
+    """Stream MSPDI XML with the stdlib SAX XMLGenerator (no lxml available)."""
+    with open(filename, "w", encoding="utf-8") as f:
+        xml = XMLGenerator(f, encoding="utf-8")
+        start, chars, end = xml.startElement, xml.characters, xml.endElement
+        no_attrs = {}
+
+        @contextmanager
+        def element(tag, default_ns=None):
+            start(tag, {"xmlns": default_ns} if default_ns else no_attrs)
+            yield
+            end(tag)
+
+        def leaves(tags, values):
+            for tag, text in zip(tags, values):
+                start(tag, no_attrs)
+                chars(text)
+                end(tag)
+
+        xml.startDocument()
+        _write_mspdi_document(element, leaves, project_values, task_records)
+        xml.endDocument()
+
+
 class ProposalItem:
     """Represents a single task or milestone in the project."""
-    def __init__(self, name, duration=0, price=0, start_date="", is_milestone=False, indent_level=0, item_id=None):
+    __slots__ = (
+        "name", "_duration", "_duration_days", "_price", "_price_text", "_start_date", "_start_ordinal", "_end_date", "_end_ordinal",
+        "is_milestone", "indent_level", "enabled", "children", "_parent",
+        "_enabled", "_has_enabled_descendant", "_pred_display", "id", "predecessor_id", "predecessor_type", "lag", "is_start_pinned",
+    )
+
+    def __init__(self, name, duration=0, price=0, start_date="", is_milestone=False, indent_level=0, item_id=None, enabled=True):
         self.name = name
         self.duration = duration
         self.price = price
@@ -49,8 +380,14 @@ class ProposalItem:
         self.end_date = ""
         self.is_milestone = is_milestone
         self.indent_level = indent_level
-        self.enabled = tk.BooleanVar(value=True)
+        self.enabled = tk.BooleanVar(value=enabled)
+        # Plain-bool mirror of self.enabled for reads (see is_enabled)
+        self._enabled = self.enabled.get()
+        self.enabled.trace_add("write", self._on_enabled_change)
         self.children = []
+        # Set by the parent setter when children are attached; only cleared
+        # again once a disable proves no descendant is enabled
+        self._has_enabled_descendant = False
         self.parent = None
         # --- Fields for unique ID and predecessor tracking ---
         self.id = item_id # New sequential integer ID
@@ -59,6 +396,106 @@ class ProposalItem:
         self.lag = 0 # Lag in days
         # --- MODIFICATION: Add flag for manually set start dates ---
         self.is_start_pinned = False
+        # (inputs, texts) memo for the tree's Predecessor/Type cells
+        self._pred_display = None
+
+    @property
+    def duration(self):
+        return self._duration
+
+    @duration.setter
+    def duration(self, value):
+        # Cache the whole-day count so exports can classify without coercing
+        self._duration = value
+        try:
+            self._duration_days = int(value)
+        except Exception:
+            self._duration_days = 0
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        self._parent = value
+        # A new subtree may bring enabled items along; let the ancestors rescan
+        ancestor = value
+        while ancestor is not None and not ancestor._has_enabled_descendant:
+            ancestor._has_enabled_descendant = True
+            ancestor = ancestor._parent
+
+    def _on_enabled_change(self, *_):
+        """Keep is_enabled and the ancestors' _has_enabled_descendant flags in step with self.enabled."""
+        self._enabled = self.enabled.get()
+        ancestor = self._parent
+        if self._enabled:
+            while ancestor is not None and not ancestor._has_enabled_descendant:
+                ancestor._has_enabled_descendant = True
+                ancestor = ancestor._parent
+            return
+        while ancestor is not None:
+            flag = any(c._has_enabled_descendant or c.is_enabled for c in ancestor.children)
+            if flag == ancestor._has_enabled_descendant:
+                break
+            ancestor._has_enabled_descendant = flag
+            ancestor = ancestor._parent
+
+    @property
+    def is_enabled(self):
+        """Current value of self.enabled without a Tcl round-trip; writes still go through enabled.set()."""
+        return self._enabled
+
+    @property
+    def price(self):
+        return self._price
+
+    @price.setter
+    def price(self, value):
+        self._price = value
+        self._price_text = None
+
+    @property
+    def price_text(self):
+        """Price as shown in the tree and PDF, e.g. $12,500; formatted once per value."""
+        text = self._price_text
+        if text is None:
+            text = self._price_text = f"${self._price:,}"
+        return text
+
+    @property
+    def kind(self):
+        """Row kind as an index into ROW_KINDS: 0 Summary, 1 Milestone, 2 Task."""
+        if self.children:
+            return 0
+        return 1 if self.is_milestone or not self._duration_days else 2
+
+    @property
+    def start_date(self):
+        return self._start_date
+
+    @start_date.setter
+    def start_date(self, value):
+        self._start_date = value
+        try:
+            self._start_ordinal = datetime.strptime(value, "%m/%d/%y").toordinal() if value else None
+        except (TypeError, ValueError):
+            self._start_ordinal = None
+
+    @property
+    def end_date(self):
+        return self._end_date
+
+    @end_date.setter
+    def end_date(self, value):
+        # Keep a parsed ordinal alongside the display string so end-date
+        # lookups compare ints instead of re-parsing every item
+        self._end_date = value
+        try:
+            self._end_ordinal = datetime.strptime(value, "%m/%d/%y").toordinal() if value else None
+        except (TypeError, ValueError):
+            self._end_ordinal = None
+
 class ProposalGenerator:
     """
     The main application class for the PDF Proposal Generator.
@@ -71,6 +508,12 @@ class ProposalGenerator:
         self.root.geometry("1600x900")
         self.root.state('zoomed')
         self.us_holidays = holidays.UnitedStates()
+        # Business-day bitmap (see _business_days), built lazily and grown on demand
+        self._business_bitmap = None
+        self._business_base = 0
+        self._business_calendar = None
+        # _setup_reportlab_styles result, kept once the Jost fonts are in use
+        self._reportlab_styles = None
 
         # --- Initialize data ---
         self.version = tk.StringVar(value="V1") # Version of the proposal
@@ -93,7 +536,18 @@ class ProposalGenerator:
         
         # --- MODIFICATION: Store last valid start date for reverting changes ---
         self.last_project_start_date = self.project_start_date.get()
-
+        # Pending after() id for the debounced start-date recalculation
+        self._start_after_id = None
+        # Background jobs (see _run_in_bg) report back through this queue
+        self._result_q = queue.Queue()
+        self._bg_busy = False
+        # The export worker is a daemon thread; closing mid-write would drop the PDF
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Bumped whenever item paths can change; keys _pred_choices_cache
+        self._tree_generation = 0
+        # (links, order) from the last successful dependency sort
+        self._topo_cache = (None, None)
+        self._pred_choices_cache = (None, ())
 
         self.setup_ui()
         self.populate_tree()
@@ -101,46 +555,34 @@ class ProposalGenerator:
     from datetime import datetime
     from tkinter import filedialog, messagebox
     def get_project_end_date(self):
-        latest = None
-        for item in self.item_id_map.values():
-            if item.enabled.get() and item.end_date:
-                try:
-                    dt = datetime.strptime(item.end_date, "%m/%d/%y")
-                    if latest is None or dt > latest:
-                        latest = dt
-                except ValueError:
-                    pass
-        return latest.strftime("%m/%d/%y") if latest else None
-    def _draw_header_on_canvas(self, canv, doc, style_settings):
+        latest = max((item._end_ordinal for item in self.item_id_map.values()
+                      if item._end_ordinal and item.is_enabled), default=None)
+        return date.fromordinal(latest).strftime("%m/%d/%y") if latest else None
+    def _draw_header_on_canvas(self, canv, doc, hdr, h):
         """
         Draw the same header used previously, anchored to the same top-left coordinates
         on every portrait page so company/project align perfectly.
         """
-        hdr = self._create_pdf_header(style_settings)
-        _, h = hdr.wrapOn(canv, doc.width, doc.topMargin)
+        # hdr is built and wrapped once per document in _prepare_pdf (h is its
+        # wrapped height); it is passed in rather than kept on self because
+        # pages are drawn on the worker thread
 
         x = doc.leftMargin +0.09*inch  # slight right offset to match story flowable
         y = doc.pagesize[1] - doc.topMargin - h  # same anchor as a story flowable on page 1
         hdr.drawOn(canv, x, y)
     def _merge_pdfs(self, main_pdf, gantt_pdf, output_pdf):
-        """Merge main proposal PDF with Gantt chart PDF"""
-        merger = PyPDF2.PdfMerger()
-        
+        """Merge main proposal PDF with Gantt chart PDF (paths or binary streams)"""
+        # Append page trees directly; neither input has an outline worth importing,
+        # and content streams are copied as-is rather than re-encoded
+        writer = PdfWriter()
         try:
-            # Add main PDF first
-            with open(main_pdf, 'rb') as main_file:
-                merger.append(main_file)
-            
-            # Add Gantt PDF
-            with open(gantt_pdf, 'rb') as gantt_file:
-                merger.append(gantt_file)
-            
-            # Write merged PDF
+            writer.append(main_pdf, import_outline=False)
+            writer.append(gantt_pdf, import_outline=False)
+
             with open(output_pdf, 'wb') as output_file:
-                merger.write(output_file)
-                
+                writer.write(output_file)
         finally:
-            merger.close()
+            writer.close()
 
     def _draw_page_bottom_rule(self, canv, doc):
         """
@@ -158,12 +600,19 @@ class ProposalGenerator:
 
 
     def export_to_projectlibre_xml(self):
-        MSP_NS = "http://schemas.microsoft.com/project"
-        def E(tag):  # element with MSP namespace
-            return f"{{{MSP_NS}}}{tag}"
+        # Sibling/successor tasks share date strings, so parse each one once
+        _iso_cache = {}
 
         def iso_dt(x, default_time="08:00:00"):
-            """Coerce incoming date/str/datetime -> 'YYYY-MM-DDTHH:MM:SS'."""
+            """Coerce incoming date/str/datetime -> 'YYYY-MM-DDTHH:MM:SS' (memoized for strings)."""
+            if isinstance(x, str):
+                hit = _iso_cache.get(x)
+                if hit is None:
+                    hit = _iso_cache[x] = _iso_dt_uncached(x, default_time)
+                return hit
+            return _iso_dt_uncached(x, default_time)
+
+        def _iso_dt_uncached(x, default_time="08:00:00"):
             if not x:
                 # fall back to project start if available
                 try:
@@ -175,6 +624,23 @@ class ProposalGenerator:
             if isinstance(x, date):
                 return datetime(x.year, x.month, x.day, 8, 0, 0).strftime("%Y-%m-%dT%H:%M:%S")
             s = str(x).strip()
+            # Sniff the likely format and try it alone first
+            if "/" in s:
+                sniffed = "%m/%d/%y" if len(s) <= 8 else "%m/%d/%Y"
+            elif "T" in s:
+                sniffed = "%Y-%m-%dT%H:%M:%S"
+            elif "-" in s:
+                sniffed = "%Y-%m-%d"
+            else:
+                sniffed = None
+            if sniffed:
+                try:
+                    dt = datetime.strptime(s, sniffed)
+                    if sniffed != "%Y-%m-%dT%H:%M:%S":
+                        dt = dt.replace(hour=8, minute=0, second=0)
+                    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+                except ValueError:
+                    pass
             # Try ISO first
             for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"):
                 try:
@@ -210,13 +676,6 @@ class ProposalGenerator:
             hours = max(d, 0) * HOURS_PER_DAY
             return f"PT{hours}H0M0S"
 
-        def classify(item):
-            if getattr(item, "children", None):
-                return "Summary"
-            if getattr(item, "is_milestone", False) or to_int(getattr(item, "duration", 0), 0) == 0:
-                return "Milestone"
-            return "Task"
-
         # Try to ensure dates are up-to-date
         try:
             if hasattr(self, "calculate_all_dates") and callable(self.calculate_all_dates):
@@ -234,161 +693,118 @@ class ProposalGenerator:
             return
 
         # --- Build MSPDI XML -----------------------------------------------------
-        ET.register_namespace("", MSP_NS)
-        proj = ET.Element(E("Project"))
-
-        # Basic project meta
-        ET.SubElement(proj, E("Name")).text = getattr(self, "project_name", None) and self.project_name.get() or "Exported Project"
-        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        ET.SubElement(proj, E("CreationDate")).text = now
-        ET.SubElement(proj, E("LastSaved")).text = now
-        ET.SubElement(proj, E("ScheduleFromStart")).text = "1"
-        ET.SubElement(proj, E("CalendarUID")).text = "1"
-
-        # Default times/units (common MSPDI defaults)
-        ET.SubElement(proj, E("DefaultStartTime")).text = "08:00:00"
-        ET.SubElement(proj, E("DefaultFinishTime")).text = "17:00:00"
-        ET.SubElement(proj, E("MinutesPerDay")).text = str(HOURS_PER_DAY * 60)
-        ET.SubElement(proj, E("MinutesPerWeek")).text = str(HOURS_PER_DAY * 5 * 60)
-        ET.SubElement(proj, E("DaysPerMonth")).text = "20"
-
-        # Calendars (Standard)
-        cals = ET.SubElement(proj, E("Calendars"))
-        cal = ET.SubElement(cals, E("Calendar"))
-        ET.SubElement(cal, E("UID")).text = "1"
-        ET.SubElement(cal, E("Name")).text = "Standard"
-        ET.SubElement(cal, E("IsBaseCalendar")).text = "1"
-        ET.SubElement(cal, E("BaseCalendarUID")).text = "0"
-
-        # Task container
-        tasks_el = ET.SubElement(proj, E("Tasks"))
-
-        # We’ll assign UIDs in traversal order and compute outline numbers
+        # Pass 1 walks the tree to assign UIDs and outline numbers only, so
+        # predecessor links can be resolved; pass 2 streams the XML to disk
+        # without ever building a DOM.
         uid_counter = 1
-        id_map = {}        # your item.id -> UID
-        outline_stack = [] # for OutlineNumber like 1, 1.1, 1.2 ...
-
-        # Flattened list for a second pass (to add predecessor links)
-        flat_items = []
+        id_map = {}        # your item.id -> UID text (shared by UID, ID and PredecessorUID)
+        flat_items = []    # (item, uid text, row_type, outline_number, outline level text)
+        level_texts = {}   # outline level -> text, one string per depth
 
-        def walk(items, outline_level=1, prefix_numbers=None):
-            nonlocal uid_counter
-            if prefix_numbers is None:
-                prefix_numbers = []
+        # Kick off traversal
+        try:
+            root_items = list(self.template_items)
+        except Exception:
+            messagebox.showerror("Export error", "No items to export (self.template_items missing).")
+            return
 
-            for idx, item in enumerate(items or [], start=1):
-                # Skip disabled items
-                enabled = True
-                try:
-                    enabled = bool(item.enabled.get())
-                except Exception:
-                    pass
-                if not enabled:
-                    # still recurse: enabled grandchildren might exist
-                    walk(getattr(item, "children", []), outline_level+1, prefix_numbers + [idx])
-                    continue
+        # Iterative pre-order walk; the stack holds (item, outline_level, outline numbers)
+        stack = [(item, 1, (idx,)) for idx, item in reversed(list(enumerate(root_items, start=1)))]
+        while stack:
+            item, outline_level, numbers = stack.pop()
+
+            # Skip disabled items (their children are still walked: enabled grandchildren might exist)
+            enabled = item.is_enabled
+            if enabled or item._has_enabled_descendant:
+                stack.extend((child, outline_level + 1, numbers + (idx,))
+                             for idx, child in reversed(list(enumerate(item.children, start=1))))
+            if not enabled:
+                continue
 
-                row_type = classify(item)
+            # Outline number like "1.2.3"
+            outline_number = ".".join(map(str, numbers))
+            uid_text = str(uid_counter)
+            uid_counter += 1
+            id_map[item.id] = uid_text
+            level_text = level_texts.get(outline_level)
+            if level_text is None:
+                level_text = level_texts[outline_level] = str(outline_level)
+            flat_items.append((item, uid_text, ROW_KINDS[item.kind], outline_number, level_text))
 
-                # Outline number like "1.2.3"
-                outline_number = ".".join(map(str, prefix_numbers + [idx]))
-                uid = uid_counter
-                uid_counter += 1
-                id_map[getattr(item, "id", uid)] = uid  # tolerate missing id
+        # We expect attributes: predecessor_id, predecessor_type ('FS','SS','FF','SF'), and lag (days)
+        TYPE_MAP = {"FS": "1", "SS": "2", "FF": "3", "SF": "4"}
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        project_name = getattr(self, "project_name", None) and self.project_name.get() or "Exported Project"
+
+        # Shared text values, reused by every task row instead of rebuilt per task
+        ZERO, ONE, PT0 = "0", "1", "PT0H0M0S"
+        ROW_FLAGS = {"Summary": (ONE, ZERO), "Milestone": (ZERO, ONE), "Task": (ZERO, ZERO)}  # (Summary, Milestone)
+        dur_texts = {}   # duration days -> MSPDI duration text
+        lag_texts = {}   # lag days -> LinkLag text
+
+        project_values = (
+            project_name, now, now, ONE, ONE,
+            "08:00:00", "17:00:00",
+            str(HOURS_PER_DAY * 60), str(HOURS_PER_DAY * 5 * 60), "20",
+        )
 
+        def task_records():
+            """Yield (task values, predecessor link values or None) per exported task."""
+            for item, uid_text, row_type, outline_number, level_text in flat_items:
                 # Dates & Duration
-                raw_start = getattr(item, "start_date", None) or getattr(self, "project_start_date", None) and self.project_start_date.get()
-                raw_finish = getattr(item, "end_date", None) or raw_start
+                raw_start = item.start_date or getattr(self, "project_start_date", None) and self.project_start_date.get()
+                raw_finish = item.end_date or raw_start
                 start_iso = iso_dt(raw_start)
                 finish_iso = iso_dt(raw_finish)
-                dur_days = to_int(getattr(item, "duration", 0), 0)
+                dur_days = to_int(item.duration, 0)
                 # Milestone duration must be 0 hours
                 if row_type == "Milestone":
-                    dur_str = "PT0H0M0S"
+                    dur_str = PT0
                     # For safety, force Start==Finish
                     finish_iso = start_iso
-                elif row_type == "Summary":
-                    # Summary duration can be left 0; ProjectLibre rolls up
-                    dur_str = dur_to_mspdi(0)
-                    # Optional: blank start/finish is allowed; but keep ISO so it displays
                 else:
-                    dur_str = dur_to_mspdi(dur_days)
-
-                # Build <Task>
-                t = ET.SubElement(tasks_el, E("Task"))
-                ET.SubElement(t, E("UID")).text = str(uid)
-                ET.SubElement(t, E("ID")).text = str(uid)
-                ET.SubElement(t, E("Name")).text = getattr(item, "name", "") or f"Task {uid}"
-                ET.SubElement(t, E("Type")).text = "0"
-                ET.SubElement(t, E("IsNull")).text = "0"
-                ET.SubElement(t, E("CreateDate")).text = now
-
-                ET.SubElement(t, E("WBS")).text = outline_number
-                ET.SubElement(t, E("OutlineNumber")).text = outline_number
-                ET.SubElement(t, E("OutlineLevel")).text = str(outline_level)
-
-                ET.SubElement(t, E("Start")).text = start_iso
-                ET.SubElement(t, E("Finish")).text = finish_iso
-                ET.SubElement(t, E("Duration")).text = dur_str
-                # 7 = Days, 5 = Hours in MSPDI; since we emit hours, set Hours (5)
-                ET.SubElement(t, E("DurationFormat")).text = "5"
-
-                # Flags
-                ET.SubElement(t, E("Summary")).text = "1" if row_type == "Summary" else "0"
-                ET.SubElement(t, E("Milestone")).text = "1" if row_type == "Milestone" else "0"
-                ET.SubElement(t, E("Active")).text = "1"
-                ET.SubElement(t, E("Manual")).text = "0"
-
-                # Keep for predecessor linking pass
-                flat_items.append((item, uid))
-
-                # Recurse
-                walk(getattr(item, "children", []), outline_level+1, prefix_numbers + [idx])
-
-        # Kick off traversal
-        try:
-            root_items = list(self.template_items)
-        except Exception:
-            messagebox.showerror("Export error", "No items to export (self.template_items missing).")
-            return
-
-        walk(root_items, outline_level=1)
-
-        # Add PredecessorLink per task
-        # We expect attributes: predecessor_id, predecessor_type ('FS','SS','FF','SF'), and lag (days)
-        TYPE_MAP = {"FS": "1", "SS": "2", "FF": "3", "SF": "4"}
-
-        # Build mapping from UID -> <Task> element to attach links
-        uid_to_task_el = { t.find(E("UID")).text: t for t in tasks_el.findall(E("Task")) }
-
-        for item, uid in flat_items:
-            pred_id = getattr(item, "predecessor_id", None)
-            if not pred_id:
-                continue
-            pred_uid = id_map.get(pred_id)
-            if not pred_uid:
-                continue
-
-            ptype = getattr(item, "predecessor_type", None) or "FS"
-            ptype_val = TYPE_MAP.get(ptype.upper(), "1")
-            lag_days = to_int(getattr(item, "lag", 0), 0)
-            # MSPDI lag is in tenths of minutes if using numeric LinkLag; safer to use Duration+LagFormat:
-            # We'll set LinkLag as hours*60*10, and LagFormat=5 (hours)
-            link_lag_tenths_min = lag_days * HOURS_PER_DAY * 60 * 10
-
-            task_el = uid_to_task_el.get(str(uid))
-            if task_el is None:
-                continue
-            pl = ET.SubElement(task_el, E("PredecessorLink"))
-            ET.SubElement(pl, E("PredecessorUID")).text = str(pred_uid)
-            ET.SubElement(pl, E("Type")).text = ptype_val   # 1=FS,2=SS,3=FF,4=SF
-            ET.SubElement(pl, E("CrossProject")).text = "0"
-            ET.SubElement(pl, E("LinkLag")).text = str(link_lag_tenths_min)
-            ET.SubElement(pl, E("LagFormat")).text = "5"    # 5 = Hours
+                    # Summary duration can be left 0; ProjectLibre rolls up
+                    # (blank start/finish is allowed; but keep ISO so it displays)
+                    if row_type == "Summary":
+                        dur_days = 0
+                    dur_str = dur_texts.get(dur_days)
+                    if dur_str is None:
+                        dur_str = dur_texts[dur_days] = dur_to_mspdi(dur_days)
+
+                # <Task>; values follow MSP_TASK_TAGS order
+                summary_flag, milestone_flag = ROW_FLAGS[row_type]
+                task_values = (
+                    uid_text, uid_text, item.name or f"Task {uid_text}", ZERO, ZERO, now,
+                    outline_number, outline_number, level_text,
+                    start_iso, finish_iso, dur_str,
+                    # 7 = Days, 5 = Hours in MSPDI; since we emit hours, set Hours (5)
+                    "5",
+                    summary_flag, milestone_flag,
+                    ONE, ZERO,
+                )
 
-        # Write file
-        tree = ET.ElementTree(proj)
-        tree.write(filename, encoding="utf-8", xml_declaration=True)
+                # PredecessorLink, resolved against the UIDs from pass 1
+                link_values = None
+                pred_id = item.predecessor_id
+                pred_uid = id_map.get(pred_id) if pred_id else None
+                if pred_uid:
+                    ptype = item.predecessor_type or "FS"
+                    ptype_val = TYPE_MAP.get(ptype.upper(), "1")
+                    lag_days = to_int(item.lag, 0)
+                    # MSPDI lag is in tenths of minutes if using numeric LinkLag; safer to use Duration+LagFormat:
+                    # We'll set LinkLag as hours*60*10, and LagFormat=5 (hours)
+                    lag_text = lag_texts.get(lag_days)
+                    if lag_text is None:
+                        lag_text = lag_texts[lag_days] = str(lag_days * HOURS_PER_DAY * 60 * 10)
+                    # Type: 1=FS,2=SS,3=FF,4=SF; LagFormat 5 = Hours
+                    link_values = (pred_uid, ptype_val, ZERO, lag_text, "5")
+
+                yield task_values, link_values
+
+        if HAS_LXML:
+            _write_mspdi_lxml(filename, project_values, task_records())
+        else:
+            _write_mspdi_sax(filename, project_values, task_records())
 
         messagebox.showinfo("Export complete", f"Exported MSPDI XML for ProjectLibre:\n{filename}\n\n"
                                                "Open ProjectLibre → File → Open → select this XML.")
@@ -421,24 +837,48 @@ class ProposalGenerator:
             "ID", "Parent ID", "Price", "Type", "Indent"
         ]
 
+        _date_cache = {}
+
         def _fmt_date(val):
-            """Return YYYY-MM-DD or ''."""
+            """Return YYYY-MM-DD or '' (memoized for strings)."""
+            if val.__class__ is str:
+                hit = _date_cache.get(val)
+                if hit is None:
+                    hit = _date_cache[val] = _fmt_str_date(val)
+                return hit
             if not val:
                 return ""
             if isinstance(val, datetime):
                 return val.date().isoformat()
             if isinstance(val, date):
                 return val.isoformat()
-            s = str(val).strip()
-            # ISO attempt
-            try:
-                return datetime.fromisoformat(s).date().isoformat()
-            except Exception:
+            return _fmt_str_date(str(val))
+
+        def _fmt_str_date(text):
+            # Branches ordered by how often they occur; each returns what the
+            # ISO-then-US parse chain would, without raising on the way
+            s = text.strip()
+            if not s:
+                return ""
+            # The scheduler's own MM/DD/YY dates: neither parse accepts a
+            # two-digit year, so they pass through unchanged
+            if len(s) == 8 and s[2] == "/" and s[5] == "/":
+                return s
+            if len(s) == 10 and s[2] == "/" and s[5] == "/":
                 # Common US format
                 try:
                     return datetime.strptime(s, "%m/%d/%Y").date().isoformat()
-                except Exception:
-                    return s  # last resort; Smartsheet may still parse it
+                except ValueError:
+                    return s
+            # ISO attempt
+            try:
+                return datetime.fromisoformat(s).date().isoformat()
+            except ValueError:
+                pass
+            try:
+                return datetime.strptime(s, "%m/%d/%Y").date().isoformat()
+            except ValueError:
+                return s  # last resort; Smartsheet may still parse it
 
         def _coerce_int(x, default=0):
             try:
@@ -454,24 +894,14 @@ class ProposalGenerator:
 
         def _pred_string(it):
             """Build Smartsheet-friendly predecessor string 'IDType±Lag'."""
-            pid = getattr(it, "predecessor_id", None)
+            pid = it.predecessor_id
             if not pid:
                 return ""
-            ptype = getattr(it, "predecessor_type", None) or "FS"
-            lag = _coerce_int(getattr(it, "lag", 0), 0)
+            ptype = it.predecessor_type or "FS"
+            lag = _coerce_int(it.lag, 0)
             lag_str = f"+{lag}d" if lag > 0 else (f"{lag}d" if lag < 0 else "")
             return f"{pid}{ptype}{lag_str}"
 
-        def _classify(it):
-            # Summary if it has children
-            has_children = bool(getattr(it, "children", None))
-            if has_children:
-                return "Summary"
-            # Milestone if flagged or duration coerces to 0
-            if getattr(it, "is_milestone", False) or _coerce_int(getattr(it, "duration", 0), 0) == 0:
-                return "Milestone"
-            return "Task"
-
         # Fallback project start (string)
         proj_start = ""
         try:
@@ -479,27 +909,31 @@ class ProposalGenerator:
         except Exception:
             pass
 
-        rows = []
+        row_count = 0
 
-        def _walk(items, parent_id=None, indent=0):
-            for it in items or []:
+        def _walk(writer, items):
+            """Write one CSV row per enabled item, in header order, depth-first."""
+            nonlocal row_count
+            # Iterative pre-order walk; the stack holds (item, parent_id, indent)
+            stack = [(it, None, 0) for it in reversed(items or [])]
+            while stack:
+                it, parent_id, indent = stack.pop()
                 # Skip disabled rows
-                enabled = True
-                try:
-                    enabled = bool(it.enabled.get())
-                except Exception:
-                    enabled = True
+                enabled = it.is_enabled
+                # Still descend under a disabled header, in case enabled children exist
+                if enabled or it._has_enabled_descendant:
+                    child_parent_id = it.id
+                    stack.extend((child, child_parent_id, indent + 1)
+                                 for child in reversed(it.children))
                 if not enabled:
-                    # Still descend, in case enabled children exist under a disabled header
-                    _walk(getattr(it, "children", []), parent_id=getattr(it, "id", parent_id), indent=indent+1)
                     continue
 
-                row_type = _classify(it)
+                row_type = ROW_KINDS[it.kind]
 
                 # Pull raw dates
-                raw_start = getattr(it, "start_date", "") or ""
-                raw_finish = getattr(it, "end_date", "") or ""
-                duration = getattr(it, "duration", 0)
+                raw_start = it.start_date or ""
+                raw_finish = it.end_date or ""
+                duration = it.duration
 
                 # Normalize strings/ints
                 start = str(raw_start).strip()
@@ -535,21 +969,20 @@ class ProposalGenerator:
                     dur_out = dur_int
                     pred_out = _pred_string(it)
 
-                rows.append({
-                    "Task Name": getattr(it, "name", ""),
-                    "Start": start_out,
-                    "Finish": finish_out,
-                    "Duration": dur_out,
-                    "Predecessors": pred_out,
-                    "ID": getattr(it, "id", ""),
-                    "Parent ID": parent_id if parent_id is not None else "",
-                    "Price": _price_val(it),
-                    "Type": row_type,
-                    "Indent": indent
-                })
+                writer.writerow((
+                    it.name,
+                    start_out,
+                    finish_out,
+                    dur_out,
+                    pred_out,
+                    it.id,
+                    parent_id if parent_id is not None else "",
+                    _price_val(it),
+                    row_type,
+                    indent
+                ))
+                row_count += 1
 
-                # Recurse into children
-                _walk(getattr(it, "children", []), parent_id=getattr(it, "id", ""), indent=indent+1)
 
         # Kick off traversal from your top-level list
         try:
@@ -558,22 +991,19 @@ class ProposalGenerator:
             messagebox.showerror("Export error", "No items to export (self.template_items missing).")
             return
 
-        _walk(root_items, parent_id=None, indent=0)
-
-        # Write CSV
+        # Stream rows straight to the CSV while walking
         try:
             with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
-                writer.writeheader()
-                for r in rows:
-                    writer.writerow(r)
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                _walk(writer, root_items)
         except Exception as e:
             messagebox.showerror("Export error", f"Failed to write CSV:\n{e}")
             return
 
         messagebox.showinfo(
             "Export complete",
-            f"Exported {len(rows)} rows to:\n{filename}\n\n"
+            f"Exported {row_count} rows to:\n{filename}\n\n"
             "Smartsheet tips:\n"
             "• Map 'Task Name' to Primary Column\n"
             "• Map Start / Finish (date), Duration (number), Predecessors\n"
@@ -587,110 +1017,22 @@ class ProposalGenerator:
         """Create the default template structure with sequential predecessors."""
         items = []
         all_tasks = []
-
-        def create_and_collect_task(name, duration, price, is_milestone, indent_level):
+        # open_items[level] is the most recent item at that indent level
+        open_items = []
+        for name, duration, price, is_milestone, indent_level in DEFAULT_TEMPLATE_ROWS:
             self.task_counter += 1
             item = ProposalItem(name, duration, price, "", is_milestone, indent_level, self.task_counter)
             if not is_milestone:
                 all_tasks.append(item)
-            return item
-
-        # Project Initiation
-        proj_init = create_and_collect_task("Project Initiation", 0, 0, True, 0)
-        proj_init.children = [
-            create_and_collect_task("Deposit & Contract Signed", 0, 0, False, 1),
-            create_and_collect_task("Notice to Proceed", 0, 0, False, 1),
-            create_and_collect_task("Civil Start - Civil Due Diligence", 1, 0, False, 1),
-            create_and_collect_task("Electrical Start - Electrical Due Diligence", 1, 0, False, 1),
-        ]
-        items.append(proj_init)
-
-        # Civil Engineering
-        civil_eng = create_and_collect_task("Civil Engineering", 0, 0, True, 0)
-        design_30_civil = create_and_collect_task("30% Design", 0, 0, True, 1)
-        design_30_civil.children = [
-            create_and_collect_task("30% - Planset/ Basis of Design", 20, 20000, False, 2),
-            create_and_collect_task("Pre-Development Hydrology Study", 10, 10000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        design_60_civil = create_and_collect_task("60% Design", 0, 0, True, 1)
-        design_60_civil.children = [
-            create_and_collect_task("60% - Planset", 25, 110000, False, 2),
-            create_and_collect_task("Stormwater Pollution Prevention Plan", 10, 6000, False, 2),
-            create_and_collect_task("Post-Development Hydrology Study", 10, 15000, False, 2),
-            create_and_collect_task("Stormwater Management Report", 15, 12000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        design_90_civil = create_and_collect_task("90% Design", 0, 0, True, 1)
-        design_90_civil.children = [
-            create_and_collect_task("90% - Planset", 5, 35000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        ifc_design_civil = create_and_collect_task("IFC Design", 0, 0, True, 1)
-        ifc_design_civil.children = [create_and_collect_task("IFC - Planset", 15, 56500, False, 2)]
-        Studies_update = create_and_collect_task("Studies Updates", 5, 6500, True, 1)
-        Studies_update.children = [
-            create_and_collect_task("Stormwater Pollution Prevention Plan", 5, 1000, False, 2),
-            create_and_collect_task("Post-Development Hydrology Study", 5, 2500, False, 2),
-            create_and_collect_task("Stormwater Management Report", 5, 3000, False, 2),
-        ]
-        civil_eng.children = [design_30_civil, design_60_civil, design_90_civil, ifc_design_civil,Studies_update]
-        items.append(civil_eng)
-
-        # Electrical Engineering
-        elec_eng = create_and_collect_task("Electrical Engineering", 0, 0, True, 0)
-        design_30_elec = create_and_collect_task("30% Design", 0, 0, True, 1)
-        design_30_elec.children = [
-            create_and_collect_task("30% - Planset/Basis of Design", 11, 40000, False, 2),
-            create_and_collect_task("Reactive Power Study", 6, 18500, False, 2),
-            create_and_collect_task("MV - Short Circuit Study", 5, 6500, False, 2),
-            create_and_collect_task("SAM Model", 3, 5000, False, 2),
-            create_and_collect_task("PV SYST", 3, 5000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        design_60_elec = create_and_collect_task("60% Design", 0, 0, True, 1)
-        design_60_elec.children = [
-            create_and_collect_task("60% - Planset", 14, 80000, False, 2),
-            create_and_collect_task("DC - Short Circuit Study", 3, 6500, False, 2),
-            create_and_collect_task("Under Ground Cable Thermal Study", 8, 10000, False, 2),
-            create_and_collect_task("Grounding Study", 8, 13000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        design_90_elec = create_and_collect_task("90% Design", 0, 0, True, 1)
-        design_90_elec.children = [
-            create_and_collect_task("90% - Planset", 13, 63500, False, 2),
-            create_and_collect_task("Load Flow Study", 2, 13000, False, 2),
-            create_and_collect_task("Coordination Study", 2, 9500, False, 2),
-            create_and_collect_task("Arc Flash Study", 5, 13000, False, 2),
-            create_and_collect_task("Client Review", 10, 0, False, 2),
-        ]
-        ifc_design_elec = create_and_collect_task("IFC Design", 0, 0, True, 1)
-        ifc_design_elec.children = [
-            create_and_collect_task("IFC - Planset", 10, 13000, False, 2),
-        ]
-        elec_eng.children = [design_30_elec, design_60_elec, design_90_elec, ifc_design_elec]
-        items.append(elec_eng)
+            del open_items[indent_level:]
+            if indent_level:
+                parent = open_items[-1]
+                parent.children.append(item)
+                item.parent = parent
+            else:
+                items.append(item)
+            open_items.append(item)
 
-        # Structural Engineering
-        struct_eng = create_and_collect_task("Structural Engineering", 0, 0, True, 0)
-        struct_eng.children = [
-            create_and_collect_task("Structural Engineering (Except racking foundation design)", 10, 25000, False, 1),
-        ]
-        items.append(struct_eng)
-
-        # Project Closeout
-        closeout = create_and_collect_task("Project Closeout", 0, 0, True, 0)
-        items.append(closeout)
-
-        # --- Set parent relationships ---
-        def set_parents(item_list):
-            for item in item_list:
-                for child in item.children:
-                    child.parent = item
-                    if child.children:
-                        set_parents(child.children)
-        set_parents(items)
-        
         # --- Set default sequential predecessors ---
         for i in range(1, len(all_tasks)):
             all_tasks[i].predecessor_id = all_tasks[i-1].id
@@ -824,16 +1166,34 @@ class ProposalGenerator:
         
         # Event Bindings
         self.tree.bind('<Double-1>', self.on_item_double_click)
-        self.tree.bind('<Button-1>', self.on_item_click, add='+')
-        self.tree.bind('<ButtonPress-1>', self.on_drag_start, add='+')
+        self.tree.bind('<<TreeviewClose>>', self.on_tree_close)
+        self.tree.bind('<ButtonPress-1>', self.on_button_press)
         self.tree.bind('<B1-Motion>', self.on_drag_motion, add='+')
         self.tree.bind('<ButtonRelease-1>', self.on_drag_release, add='+')
         self.tree.bind('<Control-ButtonPress-1>', self.on_link_start)
         self.tree.bind('<Control-B1-Motion>', self.on_link_drag)
         self.tree.bind('<Control-ButtonRelease-1>', self.on_link_drop)
+        self._rebuild_col_index()
+
+    def _rebuild_col_index(self):
+        """Cache the display column order; call whenever displaycolumns changes."""
+        # Row values are always stored in 'columns' order, whatever the display order
+        self._value_cols = tuple(self.tree['columns'])
+        self._display_cols = tuple(self.tree['displaycolumns'])
+        self._col_id_to_name = {f"#{i + 1}": name for i, name in enumerate(self._display_cols)}
 
     def handle_project_start_change(self, *args):
-        """Handle changes to the main project start date."""
+        """Handle changes to the main project start date.
+
+        Writes are coalesced so only the value left after typing settles
+        triggers validation, the confirm dialog and the recalculation.
+        """
+        if self._start_after_id is not None:
+            self.root.after_cancel(self._start_after_id)
+        self._start_after_id = self.root.after(START_CHANGE_DELAY_MS, self._do_start_change)
+
+    def _do_start_change(self):
+        self._start_after_id = None
         new_date = self.project_start_date.get()
         try:
             # Validate the new date format first
@@ -863,31 +1223,31 @@ class ProposalGenerator:
         if messagebox.askyesno("Confirm Clear", "Are you sure you want to clear all prices?"):
             for item in self.item_id_map.values():
                 item.price = 0
-            self.populate_tree()
-            self.expand_all_items()
+            # Only the Price cells change; update them in place
+            for tree_id in self.tree_item_map:
+                self.tree.set(tree_id, 'Price', "$0")
 
     def clear_all_predecessors(self):
         """Removes all predecessor links from all tasks."""
         if messagebox.askyesno("Confirm Clear", "Are you sure you want to clear all predecessor links?"):
             for item in self.item_id_map.values():
                 item.predecessor_id = None
-            self.populate_tree()
-            self.expand_all_items()
+            self.successors.clear()
+            for tree_id in self.tree_item_map:
+                self.tree.set(tree_id, 'Predecessor', "")
+                self.tree.set(tree_id, 'Type', "")
     
     def reset_predecessors(self):
         """Resets all tasks to have a sequential predecessor link."""
         if messagebox.askyesno("Confirm Reset", "Are you sure you want to reset all predecessors to the default sequential order?"):
+            # Outline order, walked over the items the tree is built from
             ordered_tasks = []
-            def get_tasks_in_order(tree_item_ids):
-                for tree_id in tree_item_ids:
-                    task_obj = self.tree_item_map.get(tree_id)
-                    if task_obj and not task_obj.is_milestone and task_obj.enabled.get():
-                        ordered_tasks.append(task_obj)
-                    children = self.tree.get_children(tree_id)
-                    if children:
-                        get_tasks_in_order(children)
-
-            get_tasks_in_order(self.tree.get_children())
+            stack = list(reversed(self.template_items))
+            while stack:
+                task_obj = stack.pop()
+                if not task_obj.is_milestone and task_obj.is_enabled:
+                    ordered_tasks.append(task_obj)
+                stack.extend(reversed(task_obj.children))
             
             # First, clear all existing predecessors for non-milestone tasks
             for task in self.item_id_map.values():
@@ -898,9 +1258,7 @@ class ProposalGenerator:
                 for i in range(1, len(ordered_tasks)):
                     ordered_tasks[i].predecessor_id = ordered_tasks[i-1].id
             
-            self.calculate_all_dates() # Recalculate dates after resetting
-            self.populate_tree()
-            self.expand_all_items()
+            self.calculate_all_dates() # Recalculate dates after resetting; this also refreshes the rows
 
     def change_logo(self):
         """Open a file dialog to select a new logo file."""
@@ -920,16 +1278,25 @@ class ProposalGenerator:
         if filepath:
             self.client_logo_path.set(filepath)
 
-    def on_drag_start(self, event):
+    def on_button_press(self, event):
+        """Single left-button handler: resolve the hit once, then click and start any drag."""
+        hit = (self.tree.identify_row(event.y),
+               self.tree.identify("region", event.x, event.y),
+               self.tree.identify_column(event.x))
+        self.on_item_click(event, hit)
+        self.on_drag_start(event, hit)
+
+    def on_drag_start(self, event, hit=None):
         """Prepares for reordering an item or a column."""
-        region = self.tree.identify("region", event.x, event.y)
+        item_id, region, column_id = hit or (self.tree.identify_row(event.y),
+                                             self.tree.identify("region", event.x, event.y),
+                                             self.tree.identify_column(event.x))
 
         if region == "heading":
             self.column_drag_data["start_x"] = event.x
-            self.column_drag_data["col_id"] = self.tree.identify_column(event.x)
+            self.column_drag_data["col_id"] = column_id
         else:
-            if self.tree.identify_column(event.x) != '#0': return 
-            item_id = self.tree.identify_row(event.y)
+            if column_id != '#0': return 
             if item_id and self.tree.parent(item_id):
                 self.drag_data["item"] = item_id
                 self.drag_data["index"] = self.tree.index(item_id)
@@ -942,8 +1309,12 @@ class ProposalGenerator:
 
         if not self.drag_data.get("item"): return
         drag_item = self.drag_data["item"]
-        parent = self.tree.parent(drag_item)
-        self.tree.move(drag_item, parent, self.tree.index(self.tree.identify_row(event.y)))
+        target_index = self.tree.index(self.tree.identify_row(event.y))
+        # Only move when the drop slot changes; each move re-lays out the tree
+        if target_index == self.drag_data["index"]:
+            return
+        self.tree.move(drag_item, self.tree.parent(drag_item), target_index)
+        self.drag_data["index"] = target_index
 
     def on_drag_release(self, event):
         """Finalizes the item's new position or reorders columns."""
@@ -956,9 +1327,10 @@ class ProposalGenerator:
                 dragged_index = int(dragged_col_id.replace('#','')) - 1
                 target_index = int(target_col_id.replace('#','')) - 1
                 
-                cols = list(self.tree['displaycolumns'])
+                cols = list(self._display_cols)
                 cols.insert(target_index, cols.pop(dragged_index))
                 self.tree['displaycolumns'] = tuple(cols)
+                self._rebuild_col_index()
             self.column_drag_data = {}
             return
 
@@ -977,39 +1349,47 @@ class ProposalGenerator:
         self.drag_data = {"item": None, "index": 0}
         
     def _toggle_children_enabled(self, item, enabled):
-        """Recursively sets the enabled state for an item and all its children."""
-        item.enabled.set(enabled)
-        for child in item.children:
-            self._toggle_children_enabled(child, enabled)
+        """Sets the enabled state for an item and all its descendants.
 
-    def on_item_click(self, event):
+        The Enabled cells are updated here too: the recalculation that follows
+        refreshes every row, but it bails out early on a circular dependency.
+        """
+        enabled_text = "✓" if enabled else "✗"
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            current.enabled.set(enabled)
+            tree_iid = self.id_to_tree_iid.get(current.id)
+            if tree_iid in self.tree_item_map:
+                self.tree.set(tree_iid, 'Enabled', enabled_text)
+            stack.extend(current.children)
+
+    def on_item_click(self, event, hit=None):
         """Handle single click for checkbox toggle, opening type dropdown, and highlighting."""
-        item_id = self.tree.identify_row(event.y)
+        item_id, region, column_id = hit or (self.tree.identify_row(event.y),
+                                             self.tree.identify("region", event.x, event.y),
+                                             self.tree.identify_column(event.x))
 
         if not item_id:
             self.clear_highlights()
             return
 
-        region = self.tree.identify("region", event.x, event.y)
         if region != "cell": 
             self.highlight_dependencies(item_id)
             return
 
-        column_id = self.tree.identify_column(event.x)
         item = self.tree_item_map.get(item_id)
         if not item: return
 
-        # Get current column display order to find correct index
-        display_cols = list(self.tree['displaycolumns'])
+        # Map the clicked column to its name in the current display order
+        col_name = self._col_id_to_name.get(column_id)
         
-        if column_id == f"#{display_cols.index('Enabled') + 1}":
-            new_state = not item.enabled.get()
+        if col_name == 'Enabled':
+            new_state = not item.is_enabled
             self._toggle_children_enabled(item, new_state)
-            self.populate_tree() # Refresh to show visual updates for all children
-            self.expand_all_items()
-            self.calculate_all_dates() # Recalculate after state change
+            self.calculate_all_dates() # Recalculate after state change; this also refreshes the other cells
         
-        elif column_id == f"#{display_cols.index('Type') + 1}" and not item.is_milestone:
+        elif col_name == 'Type' and not item.is_milestone:
             if item.predecessor_id:
                 self.edit_type_cell(item_id, item, column_id)
         
@@ -1022,28 +1402,31 @@ class ProposalGenerator:
         if item and not item.is_milestone:
             self.link_drag_data["start_item_id"] = item_id
 
+    def _set_row_tag(self, item_id, tag, on):
+        """Add or remove one tag on a row without rewriting its whole tag list."""
+        if item_id in self.tree_item_map:
+            self.tree.tk.call(self.tree, "tag", "add" if on else "remove", tag, item_id)
+
     def on_link_drag(self, event):
         """Updates the visual highlight while dragging."""
         if not self.link_drag_data.get("start_item_id"):
             return
 
         last_hover_id = self.link_drag_data.get("last_hover_id")
-        if last_hover_id and self.tree.exists(last_hover_id):
-            tags = list(self.tree.item(last_hover_id, 'tags'))
-            if 'linking_highlight' in tags:
-                tags.remove('linking_highlight')
-                self.tree.item(last_hover_id, tags=tuple(tags))
-        
         current_hover_id = self.tree.identify_row(event.y)
+        # Motion within the row that is already highlighted changes nothing
+        if current_hover_id and current_hover_id == last_hover_id:
+            return
+
+        if last_hover_id:
+            self._set_row_tag(last_hover_id, 'linking_highlight', False)
+        
         start_item_id = self.link_drag_data["start_item_id"]
         
         if current_hover_id and current_hover_id != start_item_id:
             item = self.tree_item_map.get(current_hover_id)
             if item and not item.is_milestone:
-                tags = list(self.tree.item(current_hover_id, 'tags'))
-                if 'linking_highlight' not in tags:
-                    tags.append('linking_highlight')
-                    self.tree.item(current_hover_id, tags=tuple(tags))
+                self._set_row_tag(current_hover_id, 'linking_highlight', True)
                 self.link_drag_data["last_hover_id"] = current_hover_id
             else:
                 self.link_drag_data["last_hover_id"] = None
@@ -1057,11 +1440,8 @@ class ProposalGenerator:
             return
 
         last_hover_id = self.link_drag_data.get("last_hover_id")
-        if last_hover_id and self.tree.exists(last_hover_id):
-            tags = list(self.tree.item(last_hover_id, 'tags'))
-            if 'linking_highlight' in tags:
-                tags.remove('linking_highlight')
-                self.tree.item(last_hover_id, tags=tuple(tags))
+        if last_hover_id:
+            self._set_row_tag(last_hover_id, 'linking_highlight', False)
 
         end_item_id = self.tree.identify_row(event.y)
         start_item = self.tree_item_map.get(start_item_id)
@@ -1071,7 +1451,7 @@ class ProposalGenerator:
             not start_item.is_milestone and not end_item.is_milestone and
             start_item.id != end_item.id):
             
-            start_item.predecessor_id = end_item.id
+            self._set_predecessor(start_item, end_item.id)
             start_item.predecessor_type = 'FS'
             start_item.lag = 0
             self.update_item_display(start_item_id, start_item)
@@ -1081,14 +1461,25 @@ class ProposalGenerator:
 
     def clear_highlights(self):
         """Removes all dependency highlighting from the tree."""
-        for item_id in self.tree_item_map:
-            if self.tree.exists(item_id):
+        # Only rows tagged by highlight_dependencies can carry the highlight tags
+        for item_id in self._highlighted:
+            if item_id in self.tree_item_map:
                 current_tags = list(self.tree.item(item_id, 'tags'))
                 if 'predecessor_highlight' in current_tags:
                     current_tags.remove('predecessor_highlight')
                 if 'successor_highlight' in current_tags:
                     current_tags.remove('successor_highlight')
                 self.tree.item(item_id, tags=tuple(current_tags))
+        self._highlighted.clear()
+
+    def _add_highlight(self, tree_id, tag):
+        """Add a highlight tag to one row and remember it for clear_highlights."""
+        if tree_id in self.tree_item_map:
+            current_tags = list(self.tree.item(tree_id, 'tags'))
+            if tag not in current_tags:
+                current_tags.append(tag)
+            self.tree.item(tree_id, tags=tuple(current_tags))
+            self._highlighted.add(tree_id)
 
     def highlight_dependencies(self, selected_item_id):
         """Highlights the predecessor and successors of the selected item."""
@@ -1099,87 +1490,90 @@ class ProposalGenerator:
             return
 
         if selected_item.predecessor_id:
-            for tree_id, item_obj in self.tree_item_map.items():
-                if item_obj.id == selected_item.predecessor_id:
-                    if self.tree.exists(tree_id):
-                        current_tags = list(self.tree.item(tree_id, 'tags'))
-                        if 'predecessor_highlight' not in current_tags:
-                            current_tags.append('predecessor_highlight')
-                        self.tree.item(tree_id, tags=tuple(current_tags))
-                    break
+            tree_id = self.id_to_tree_iid.get(selected_item.predecessor_id)
+            if tree_id:
+                self._add_highlight(tree_id, 'predecessor_highlight')
         
-        for tree_id, item_obj in self.tree_item_map.items():
-            if item_obj.predecessor_id == selected_item.id:
-                if self.tree.exists(tree_id):
-                    current_tags = list(self.tree.item(tree_id, 'tags'))
-                    if 'successor_highlight' not in current_tags:
-                        current_tags.append('successor_highlight')
-                    self.tree.item(tree_id, tags=tuple(current_tags))
+        for successor_id in self.successors.get(selected_item.id, ()):
+            tree_id = self.id_to_tree_iid.get(successor_id)
+            if tree_id:
+                self._add_highlight(tree_id, 'successor_highlight')
+
+    def _set_predecessor(self, item, predecessor_id):
+        """Point item at a new predecessor, keeping the successors index in step."""
+        if item.predecessor_id in self.successors:
+            self.successors[item.predecessor_id].discard(item.id)
+        item.predecessor_id = predecessor_id
+        if predecessor_id:
+            self.successors.setdefault(predecessor_id, set()).add(item.id)
 
     def populate_tree(self):
-        """Populate the treeview with template items and build ID maps."""
-        expanded_items = []
-        for item_id in self.tree.get_children():
-            if self.tree.item(item_id, 'open'):
-                expanded_items.append(self.tree.item(item_id, 'text'))
-            expanded_items.extend(self.get_expanded_children(item_id))
-        
+        """Populate the treeview with template items and build ID maps.
+
+        Every refresh is followed by expand_all_items, so rows are inserted
+        already open and the old expansion state is not scanned back out.
+        """
         self.tree.delete(*self.tree.get_children())
+        # Rows are only ever removed here, so the keys of tree_item_map are
+        # exactly the live iids; membership stands in for tree.exists
         self.tree_item_map = {}
         self.item_id_map = {}
-        
-        def build_id_map(items):
-            for item in items:
-                self.item_id_map[item.id] = item
-                if item.children:
-                    build_id_map(item.children)
-        build_id_map(self.template_items)
-        
-        for item in self.template_items:
-            item_id = self.add_item_to_tree(item, '')
-            if any(expanded in self.tree.item(item_id, 'text') for expanded in expanded_items):
-                self.tree.item(item_id, open=True)
-    
-    def get_expanded_children(self, item_id):
-        """Get all expanded children recursively."""
-        expanded = []
-        for child_id in self.tree.get_children(item_id):
-            if self.tree.item(child_id, 'open'):
-                expanded.append(self.tree.item(child_id, 'text'))
-                expanded.extend(self.get_expanded_children(child_id))
-        return expanded
+        self._tree_generation += 1
+        # Reverse indexes for dependency highlighting, rebuilt with the rows
+        self.id_to_tree_iid = {}    # item.id -> tree iid
+        self.successors = {}        # predecessor item.id -> ids of shown successors
+        self._highlighted = set()   # tree iids currently carrying a highlight tag
+
+        # One pre-order pass fills the ID map; rows are inserted afterwards
+        # because a predecessor can sit later in the outline than its successor
+        ordered = []    # (item, id() of its parent item, or None at the top level)
+        stack = [(item, None) for item in reversed(self.template_items)]
+        while stack:
+            item, parent_key = stack.pop()
+            self.item_id_map[item.id] = item
+            ordered.append((item, parent_key))
+            stack.extend((child, id(item)) for child in reversed(item.children))
+
+        row_ids = {None: ''}    # id(item) -> tree iid
+        for item, parent_key in ordered:
+            row_ids[id(item)] = self.add_item_to_tree(item, row_ids[parent_key])
+        self._collapsed_rows = set()
     
     def expand_all_items(self):
         """Expand all items in the tree by default."""
-        def expand_children(item_id):
-            self.tree.item(item_id, open=True)
-            for child_id in self.tree.get_children(item_id):
-                expand_children(child_id)
-        for item_id in self.tree.get_children():
-            expand_children(item_id)
+        # Rows are inserted open, so only branches collapsed since the last
+        # refresh (see on_tree_close) need reopening
+        for item_id in self._collapsed_rows:
+            if item_id in self.tree_item_map:
+                self.tree.item(item_id, open=True)
+        self._collapsed_rows.clear()
     
+    def _display_name(self, item):
+        """Tree label for an item, including its unique ID."""
+        level = item.indent_level
+        indent = TREE_INDENTS[level] if 0 <= level < len(TREE_INDENTS) else '  ' * level
+        return f"{indent}({item.id}) {item.name}"
+
     def add_item_to_tree(self, item, parent_id):
-        """Recursively add items to treeview."""
+        """Insert one item's row under parent_id and index it."""
         # Update display name to include the unique ID
-        display_name = f"{'  ' * item.indent_level}({item.id}) {item.name}"
-        enabled_text = "✓" if item.enabled.get() else "✗"
-        
-        predecessor_text = ""
-        predecessor_type_text = ""
-        if item.predecessor_id and item.predecessor_id in self.item_id_map:
-            pred_item = self.item_id_map[item.predecessor_id]
-            lag_str = f" +{item.lag}d" if item.lag > 0 else f" {item.lag}d" if item.lag < 0 else ""
-            predecessor_text = f"({pred_item.id}) {pred_item.name[:15]}{lag_str}"
-            predecessor_type_text = item.predecessor_type
+        display_name = self._display_name(item)
+        enabled_text = "✓" if item.is_enabled else "✗"
+        predecessor_text, predecessor_type_text = self._predecessor_display(item)
             
-        item_id = self.tree.insert(parent_id, 'end', text=display_name, 
-                                           values=(predecessor_text, predecessor_type_text, enabled_text, item.duration, f"${item.price:,}", item.start_date, item.end_date),
+        item_id = self.tree.insert(parent_id, 'end', text=display_name, open=True,
+                                           values=(predecessor_text, predecessor_type_text, enabled_text, item.duration, item.price_text, item.start_date, item.end_date),
                                            tags=('milestone' if item.is_milestone else 'task',))
         self.tree_item_map[item_id] = item
-        for child in item.children:
-            self.add_item_to_tree(child, item_id)
+        self.id_to_tree_iid[item.id] = item_id
+        if item.predecessor_id:
+            self.successors.setdefault(item.predecessor_id, set()).add(item.id)
         return item_id
 
+    def on_tree_close(self, event):
+        """Remember a collapsed branch so expand_all_items can reopen it."""
+        self._collapsed_rows.add(self.tree.focus())
+
     def on_item_double_click(self, event):
         """Handle double-click for inline editing or opening predecessor dialog."""
         item_id = self.tree.identify_row(event.y)
@@ -1188,23 +1582,21 @@ class ProposalGenerator:
         item = self.tree_item_map.get(item_id)
         if not item: return
 
-        display_cols = list(self.tree['displaycolumns'])
+        col_name = self._col_id_to_name.get(column_id)
         
         # New condition to edit task name in the first column
         if column_id == '#0':
             self.edit_cell(item_id, item, 'name', column_id)
-        elif column_id == f"#{display_cols.index('Enabled') + 1}":
-            new_state = not item.enabled.get()
+        elif col_name == 'Enabled':
+            new_state = not item.is_enabled
             self._toggle_children_enabled(item, new_state)
-            self.populate_tree()
-            self.expand_all_items()
             self.calculate_all_dates()
         elif not item.is_milestone:
-            if column_id == f"#{display_cols.index('Duration') + 1}": self.edit_cell(item_id, item, 'duration', column_id)
-            elif column_id == f"#{display_cols.index('Price') + 1}": self.edit_cell(item_id, item, 'price', column_id)
-            elif column_id == f"#{display_cols.index('Predecessor') + 1}": self.edit_predecessor(item_id)
-            elif column_id == f"#{display_cols.index('Start Date') + 1}": self.edit_cell(item_id, item, 'start_date', column_id)
-            elif column_id == f"#{display_cols.index('Type') + 1}":  self.edit_type_cell(item_id, item, column_id)
+            if col_name == 'Duration': self.edit_cell(item_id, item, 'duration', column_id)
+            elif col_name == 'Price': self.edit_cell(item_id, item, 'price', column_id)
+            elif col_name == 'Predecessor': self.edit_predecessor(item_id)
+            elif col_name == 'Start Date': self.edit_cell(item_id, item, 'start_date', column_id)
+            elif col_name == 'Type':  self.edit_type_cell(item_id, item, column_id)
 
     def edit_cell(self, item_id, item, attribute, column_id):
         """Create inline editor for a cell."""
@@ -1244,8 +1636,12 @@ class ProposalGenerator:
                 elif attribute == 'name':
                     if new_value.strip(): # Don't allow empty names
                         setattr(item, attribute, new_value)
-                        self.populate_tree() # Refresh the entire tree to update predecessors
-                        self.expand_all_items()
+                        self._tree_generation += 1  # the item's path changed
+                        # Refresh this row's name and the predecessor text of its successors
+                        self.tree.item(item_id, text=self._display_name(item))
+                        for tree_id, successor in self.tree_item_map.items():
+                            if successor.predecessor_id == item.id:
+                                self.update_item_display(tree_id, successor)
                         if entry and entry.winfo_exists(): entry.destroy()
                         self.current_editor = None
                         return
@@ -1328,14 +1724,26 @@ class ProposalGenerator:
         type_combo.bind("<Return>", commit_and_close)
         type_combo.bind("<Escape>", lambda e: (type_combo.destroy(), setattr(self, "current_editor", None)))
 
-    def get_item_path(self, item):
-        """Build the full path for a given item, handling the base case."""
-        path = []
+    def get_item_path(self, item, cache=None):
+        """Build the full path for a given item, handling the base case.
+
+        Pass the same cache dict for a batch of lookups to reuse ancestor
+        paths, so each node is formatted once per batch.
+        """
+        if cache is None:
+            cache = {}
+        # Walk up to the nearest ancestor whose path is already known
+        chain = []
         current_item = item
-        while current_item:
-            path.append(f"({current_item.id}) {current_item.name}")
+        while current_item and id(current_item) not in cache:
+            chain.append(current_item)
             current_item = current_item.parent
-        return " > ".join(reversed(path))
+        path = cache[id(current_item)] if current_item else ""
+        for node in reversed(chain):
+            label = f"({node.id}) {node.name}"
+            path = f"{path} > {label}" if path else label
+            cache[id(node)] = path
+        return path
 
     def edit_predecessor(self, item_id):
         """Open a dialog to set an item's predecessor."""
@@ -1349,7 +1757,7 @@ class ProposalGenerator:
         dialog.grab_set()
 
         # --- MODIFICATION: Use full path for unique predecessor names ---
-        possible_preds = {self.get_item_path(i): i.id for i in self.item_id_map.values() if not i.is_milestone and i.id != item_to_edit.id}
+        possible_preds = {path: p_id for path, p_id in self._predecessor_choices() if p_id != item_to_edit.id}
         
         frame = ttk.Frame(dialog, padding="10")
         frame.pack(fill=tk.BOTH, expand=True)
@@ -1376,14 +1784,14 @@ class ProposalGenerator:
         def save_predecessor():
             selected_path = pred_var.get()
             if selected_path in possible_preds:
-                item_to_edit.predecessor_id = possible_preds[selected_path]
+                self._set_predecessor(item_to_edit, possible_preds[selected_path])
                 item_to_edit.lag = lag_var.get()
             self.calculate_all_dates()
             self.highlight_dependencies(item_id)
             dialog.destroy()
         
         def clear_predecessor():
-            item_to_edit.predecessor_id = None
+            self._set_predecessor(item_to_edit, None)
             item_to_edit.is_start_pinned = False # Unpin if predecessor is removed
             self.calculate_all_dates()
             self.highlight_dependencies(item_id)
@@ -1393,32 +1801,80 @@ class ProposalGenerator:
         ttk.Button(button_frame, text="Clear", command=clear_predecessor).pack(side=tk.LEFT, padx=10)
         ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=10)
     
+    def _predecessor_choices(self):
+        """(path, id) for every non-milestone item, in outline order.
+
+        Cached until the tree is rebuilt or an item is renamed, so reopening
+        the predecessor dialog does not rebuild every path.
+        """
+        generation, choices = self._pred_choices_cache
+        if generation != self._tree_generation:
+            path_cache = {}
+            choices = tuple((self.get_item_path(i, path_cache), i.id)
+                            for i in self.item_id_map.values() if not i.is_milestone)
+            self._pred_choices_cache = (self._tree_generation, choices)
+        return choices
+
+    def _predecessor_display(self, item):
+        """Return the (Predecessor, Type) cell texts for an item.
+
+        The texts are memoized on the item together with the inputs they were
+        built from, so an unchanged link is not re-formatted on every refresh.
+        """
+        pred_item = self.item_id_map.get(item.predecessor_id) if item.predecessor_id else None
+        if pred_item is None:
+            return "", ""
+        key = (pred_item.id, pred_item.name, item.lag, item.predecessor_type)
+        cached = item._pred_display
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        lag_str = f" +{item.lag}d" if item.lag > 0 else f" {item.lag}d" if item.lag < 0 else ""
+        texts = (f"({pred_item.id}) {pred_item.name[:15]}{lag_str}", item.predecessor_type)
+        item._pred_display = (key, texts)
+        return texts
+
     def update_item_display(self, item_id, item):
         """Update a single item's display without refreshing entire tree."""
-        enabled_text = "✓" if item.enabled.get() else "✗"
-        predecessor_text = ""
-        predecessor_type_text = ""
-        if item.predecessor_id and item.predecessor_id in self.item_id_map:
-            pred_item = self.item_id_map[item.predecessor_id]
-            lag_str = f" +{item.lag}d" if item.lag > 0 else f" {item.lag}d" if item.lag < 0 else ""
-            predecessor_text = f"({pred_item.id}) {pred_item.name[:15]}{lag_str}"
-            predecessor_type_text = item.predecessor_type
+        enabled_text = "✓" if item.is_enabled else "✗"
+        predecessor_text, predecessor_type_text = self._predecessor_display(item)
         
         value_map = {
             'Predecessor': predecessor_text,
             'Type': predecessor_type_text,
             'Enabled': enabled_text,
             'Duration': item.duration,
-            'Price': f"${item.price:,}",
+            'Price': item.price_text,
             'Start Date': item.start_date,
             'End Date': item.end_date
         }
         
-        display_cols = self.tree['displaycolumns']
-        values_tuple = tuple(value_map[col_id] for col_id in display_cols)
+        values_tuple = tuple(value_map[col_id] for col_id in self._value_cols)
 
-        if self.tree.exists(item_id):
+        if item_id in self.tree_item_map:
             self.tree.item(item_id, values=values_tuple)
+
+    def rebuild_tree(self):
+        """Rebuild all rows after the item tree was replaced wholesale.
+
+        Called by schedule_parser.push_into_generator, which swaps in new
+        template items and relies on the generator to redraw them.
+        """
+        self.populate_tree()
+        self.expand_all_items()
+
+    def refresh_tree_values(self):
+        """Rewrite every row's values in place after a recalculation.
+
+        Structural changes (add, delete, template load) rebuild the tree with
+        populate_tree themselves; a recalculation only changes cell values, so
+        the rows, selection and expansion state are kept.
+        """
+        # Predecessor links may have been edited since the last rebuild
+        self.successors = {}
+        for tree_iid, item in self.tree_item_map.items():
+            if item.predecessor_id:
+                self.successors.setdefault(item.predecessor_id, set()).add(item.id)
+            self.update_item_display(tree_iid, item)
     
     def add_custom_item(self):
         """Add a custom item to the project."""
@@ -1502,133 +1958,244 @@ class ProposalGenerator:
         except ValueError:
             return ""
 
-        step = timedelta(days=1) if days_to_add >= 0 else timedelta(days=-1)
-        days_counted = 0
-        
         days_to_add = int(days_to_add)
-
-        if days_to_add > 0: days_to_add -= 1
-
-        while current_date.weekday() >= 5 or current_date in self.us_holidays:
-            current_date += timedelta(days=1)
-
-        while days_counted < abs(days_to_add):
-            current_date += step
-            if current_date.weekday() < 5 and current_date not in self.us_holidays:
-                days_counted += 1
-
-        while current_date.weekday() >= 5 or current_date in self.us_holidays:
-            current_date += step
-
-        return current_date.strftime("%m/%d/%y")
+        day = current_date.toordinal() - EPOCH_ORDINAL
+        reach = 2 * abs(days_to_add) + 31
+        self._business_days(day - reach, day + reach)  # make sure the calendar covers the span
+        # Roll onto a business day, then count; the start day itself counts as day one
+        offset = days_to_add - 1 if days_to_add > 0 else days_to_add
+        shifted = np.busday_offset(np.datetime64(current_date.date()), offset,
+                                   roll="forward", busdaycal=self._business_calendar)
+        return shifted.astype(date).strftime("%m/%d/%y")
 
     def _get_business_days_between(self, start_date_str, end_date_str):
         """Calculate the number of business days between two dates."""
         try:
-            start_date = datetime.strptime(start_date_str, "%m/%d/%y")
-            end_date = datetime.strptime(end_date_str, "%m/%d/%y")
-            
-            if start_date > end_date:
-                return 0
-            
-            # Count business days
-            days = (end_date - start_date).days + 1
-            business_days = 0
-            for i in range(days):
-                day = start_date + timedelta(days=i)
-                if day.weekday() < 5 and day not in self.us_holidays:
-                    business_days += 1
-            
-            return business_days
+            start = datetime.strptime(start_date_str, "%m/%d/%y").toordinal()
+            end = datetime.strptime(end_date_str, "%m/%d/%y").toordinal()
         except (ValueError, TypeError):
             return 0
+        return self._business_days_between_ordinals(start, end)
 
-    def calculate_all_dates(self, unpin_all=False):
+    def _business_days_between_ordinals(self, start_ordinal, end_ordinal):
+        """_get_business_days_between for date ordinals (None when unset)."""
+        if start_ordinal is None or end_ordinal is None or start_ordinal > end_ordinal:
+            return 0
+        start_day, end_day = start_ordinal - EPOCH_ORDINAL, end_ordinal - EPOCH_ORDINAL
+        # Count business days (inclusive) straight off the bitmap
+        business, base = self._business_days(start_day, end_day)
+        return int(np.count_nonzero(business[start_day - base:end_day - base + 1]))
+
+    def _business_days(self, first_day, last_day):
         """
-        Calculate all dates based on dependencies and durations.
-        If unpin_all is True, it will ignore all manually set dates.
+        Return (bitmap, base): a bool array of business days (Mon-Fri minus US
+        holidays) where bitmap[k] is day base + k, in days since the epoch.
+        The bitmap is cached and rebuilt over whole years, at least
+        BUSINESS_HORIZON_DAYS long, whenever [first_day, last_day] falls outside it.
         """
-        if unpin_all:
-            for item in self.item_id_map.values():
-                item.is_start_pinned = False
+        bitmap, base = self._business_bitmap, self._business_base
+        if bitmap is not None and base <= first_day and last_day < base + bitmap.shape[0]:
+            return bitmap, base
+        if bitmap is not None:
+            first_day, last_day = min(first_day, base), max(last_day, base + bitmap.shape[0] - 1)
+
+        first = date.fromordinal(first_day + EPOCH_ORDINAL).replace(month=1, day=1)
+        last = max(date.fromordinal(last_day + EPOCH_ORDINAL), first + timedelta(days=BUSINESS_HORIZON_DAYS))
+        years = range(first.year, last.year + 1)
+        for year in years:
+            date(year, 1, 1) in self.us_holidays  # populates that year's holidays
+
+        base = first.toordinal() - EPOCH_ORDINAL
+        days = np.arange(base, date(last.year, 12, 31).toordinal() - EPOCH_ORDINAL + 1)
+        weekdays = (days + 3) % 7 < 5  # 1970-01-01 was a Thursday
+        bitmap = weekdays.copy()
+        hols = np.array([d.toordinal() - EPOCH_ORDINAL for d in self.us_holidays if d.year in years], dtype=np.int64)
+        bitmap[hols - base] = False
+
+        self._business_bitmap, self._business_base = bitmap, base
+        self._business_calendar = np.busdaycalendar(
+            weekmask="1111100", holidays=days[weekdays & ~bitmap].astype("datetime64[D]"))
+        return bitmap, base
+
+    def _schedule_sorted_tasks(self, tasks):
+        """
+        Set start/end dates for enabled, non-milestone tasks given in topological order.
 
-        for item in self.item_id_map.values():
-            if not item.is_start_pinned:
-                item.start_date = ""
-                item.end_date = ""
+        The task fields are packed into parallel numpy arrays and propagated by
+        the numba kernel (_propagate) when available, otherwise one dependency
+        level at a time with vectorized business-day offsets. Both match
+        _add_business_days exactly.
+        """
+        n = len(tasks)
+        if not n:
+            return
+
+        def parse(date_str):
+            try:
+                return np.datetime64(datetime.strptime(date_str, "%m/%d/%y").date(), "D")
+            except (TypeError, ValueError):
+                return np.datetime64("NaT", "D")
+
+        position = {item.id: i for i, item in enumerate(tasks)}
+        durations = np.array([int(item.duration) for item in tasks], dtype=np.int64)
+        lags = np.array([int(item.lag) for item in tasks], dtype=np.int64)
+        pinned = np.array([bool(item.is_start_pinned) for item in tasks], dtype=np.bool_)
+        pred_types = np.array([PRED_TYPE_CODES.get(item.predecessor_type, -1) for item in tasks], dtype=np.int8)
+        pred_pos = np.full(n, -1, dtype=np.int64)
+        depth = np.zeros(n, dtype=np.int64)
+        for i, item in enumerate(tasks):
+            if item.predecessor_id:
+                p = position.get(item.predecessor_id)
+                if p is not None:
+                    pred_pos[i] = p
+                    depth[i] = depth[p] + 1
+
+        project_start_str = self.project_start_date.get()
+        project_start = parse(project_start_str)
+        starts = np.full(n, np.datetime64("NaT", "D"))
+        for i in np.flatnonzero(pinned):
+            ordinal = tasks[i]._start_ordinal
+            if ordinal is not None:
+                starts[i] = np.datetime64(ordinal - EPOCH_ORDINAL, "D")
+        ends = np.full(n, np.datetime64("NaT", "D"))
+        from_project_start = np.zeros(n, dtype=np.bool_)
+
+        # Holiday calendar wide enough for every offset the schedule can reach
+        known = starts[~np.isnat(starts)].view(np.int64)
+        if not np.isnat(project_start):
+            known = np.append(known, project_start.view(np.int64))
+        if known.size:
+            span = 2 * int(np.abs(durations).sum() + np.abs(lags).sum() + n) + 31
+            business, base = self._business_days(int(known.min()) - span, int(known.max()) + span)
+        else:
+            business, base = self._business_days(0, 0)
 
-        all_tasks = [item for item in self.item_id_map.values() if item.enabled.get() and not item.is_milestone]
+        if HAS_NUMBA:
+            # JIT path: one sequential pass over the business-day bitmap
+            _propagate(starts.view(np.int64), ends.view(np.int64), durations, pred_pos, pred_types, lags,
+                       pinned, from_project_start, project_start.view(np.int64), business, base)
+        else:
+            _propagate_by_level(starts, ends, durations, pred_pos, depth, pred_types, lags,
+                                pinned, from_project_start, project_start, self._business_calendar)
+
+        start_dates = starts.astype(object)
+        end_dates = ends.astype(object)
+        for i, item in enumerate(tasks):
+            if not pinned[i]:
+                if from_project_start[i]:
+                    item.start_date = project_start_str
+                else:
+                    item.start_date = start_dates[i].strftime("%m/%d/%y") if start_dates[i] else ""
+            item.end_date = end_dates[i].strftime("%m/%d/%y") if end_dates[i] else ""
 
-        graph = {item.id: [] for item in all_tasks}
-        in_degree = {item.id: 0 for item in all_tasks}
-        for item in all_tasks:
-            if item.predecessor_id and item.predecessor_id in self.item_id_map:
-                pred = self.item_id_map[item.predecessor_id]
-                if pred.enabled.get():
-                    graph[item.predecessor_id].append(item.id)
-                    in_degree[item.id] += 1
+    def _topological_order(self, all_tasks):
+        """
+        Return the ids of all_tasks in dependency order, or None on a cycle.
 
-        queue = [item_id for item_id in in_degree if in_degree[item_id] == 0]
+        The order only depends on which tasks link to which enabled
+        predecessors, so it is cached under that link list and reused while
+        edits leave the links alone (durations, lags, dates, prices).
+        """
+        item_id_map = self.item_id_map
+        links = tuple(
+            (item.id, item.predecessor_id
+             if item.predecessor_id and item.predecessor_id in item_id_map
+             and item_id_map[item.predecessor_id].is_enabled else None)
+            for item in all_tasks)
+        cached_links, cached_order = self._topo_cache
+        if links == cached_links:
+            return cached_order
+
+        graph = {item_id: [] for item_id, _ in links}
+        in_degree = {item_id: 0 for item_id, _ in links}
+        for item_id, pred_id in links:
+            if pred_id:
+                graph[pred_id].append(item_id)
+                in_degree[item_id] += 1
+
+        # deque: popleft is O(1) where list.pop(0) shifts the whole queue
+        ready = deque(item_id for item_id in in_degree if in_degree[item_id] == 0)
         sorted_order = []
-        while queue:
-            u_id = queue.pop(0)
+        while ready:
+            u_id = ready.popleft()
             sorted_order.append(u_id)
             for v_id in graph.get(u_id, []):
                 in_degree[v_id] -= 1
                 if in_degree[v_id] == 0:
-                    queue.append(v_id)
+                    ready.append(v_id)
+
+        if len(sorted_order) != len(links):
+            return None
+        self._topo_cache = (links, sorted_order)
+        return sorted_order
+
+    def calculate_all_dates(self, unpin_all=False):
+        """
+        Calculate all dates based on dependencies and durations.
+        If unpin_all is True, it will ignore all manually set dates.
+        """
+        # One pass: unpin if asked, clear unpinned dates, collect schedulable tasks
+        all_tasks = []
+        for item in self.item_id_map.values():
+            if unpin_all:
+                item.is_start_pinned = False
+            if not item.is_start_pinned:
+                item.start_date = ""
+                item.end_date = ""
+            if item.is_enabled and not item.is_milestone:
+                all_tasks.append(item)
 
-        if len(sorted_order) != len(all_tasks):
+        sorted_order = self._topological_order(all_tasks)
+        if sorted_order is None:
             messagebox.showerror("Calculation Error", "A circular dependency was detected. Please fix the predecessors.")
             return
 
-        project_start = self.project_start_date.get()
-        for item_id in sorted_order:
-            item = self.item_id_map[item_id]
+        self._schedule_sorted_tasks([self.item_id_map[item_id] for item_id in sorted_order])
 
-            if not item.is_start_pinned:
-                pred_item = self.item_id_map.get(item.predecessor_id) if item.predecessor_id else None
-                
-                if pred_item and pred_item.enabled.get() and pred_item.end_date:
-                    if item.predecessor_type == 'FS':
-                        item.start_date = self._add_business_days(pred_item.end_date, item.lag + 1)
-                    elif item.predecessor_type == 'SS':
-                        item.start_date = self._add_business_days(pred_item.start_date, item.lag)
-                    elif item.predecessor_type == 'FF':
-                        finish_date = self._add_business_days(pred_item.end_date, item.lag)
-                        item.start_date = self._add_business_days(finish_date, -item.duration + 1)
-                    elif item.predecessor_type == 'SF':
-                        finish_date = self._add_business_days(pred_item.start_date, item.lag)
-                        item.start_date = self._add_business_days(finish_date, -item.duration + 1)
-                else:
-                    item.start_date = project_start
-            
-            item.end_date = self._add_business_days(item.start_date, item.duration)
-
-        def calculate_milestone_rollup(items):
-            for item in items:
-                if item.enabled.get() and item.is_milestone and item.children:
-                    calculate_milestone_rollup(item.children)
-                    enabled_children = [c for c in item.children if c.enabled.get()]
-                    if enabled_children:
-                        valid_starts = [datetime.strptime(c.start_date, "%m/%d/%y") for c in enabled_children if c.start_date]
-                        valid_ends = [datetime.strptime(c.end_date, "%m/%d/%y") for c in enabled_children if c.end_date]
-                        
-                        if valid_starts: item.start_date = min(valid_starts).strftime("%m/%d/%y")
-                        if valid_ends: item.end_date = max(valid_ends).strftime("%m/%d/%y")
-                        
-                        # --- MODIFICATION: Correct milestone duration calculation ---
-                        item.duration = self._get_business_days_between(item.start_date, item.end_date)
-                        item.price = sum(c.price for c in enabled_children)
-        calculate_milestone_rollup(self.template_items)
+        # Milestone rollup, post-order: a milestone's children are rolled up
+        # before it. Only enabled milestones with children are visited, and
+        # the walk descends through them alone, as the recursive version did.
+        def rolls_up(item):
+            return item.is_enabled and item.is_milestone and item.children
+
+        stack = [(item, False) for item in reversed(self.template_items) if rolls_up(item)]
+        while stack:
+            item, children_done = stack.pop()
+            if not children_done:
+                stack.append((item, True))
+                stack.extend((c, False) for c in reversed(item.children) if rolls_up(c))
+                continue
+            # One sweep over the children for the date span and price total
+            first = last = None
+            total_price = 0
+            any_enabled = False
+            for c in item.children:
+                if not c.is_enabled:
+                    continue
+                any_enabled = True
+                total_price += c.price
+                if c._start_ordinal and (first is None or c._start_ordinal < first):
+                    first = c._start_ordinal
+                if c._end_ordinal and (last is None or c._end_ordinal > last):
+                    last = c._end_ordinal
+            if any_enabled:
+                if first: item.start_date = date.fromordinal(first).strftime("%m/%d/%y")
+                if last: item.end_date = date.fromordinal(last).strftime("%m/%d/%y")
+
+                # --- MODIFICATION: Correct milestone duration calculation ---
+                item.duration = self._business_days_between_ordinals(item._start_ordinal, item._end_ordinal)
+                item.price = total_price
         end_date = self.get_project_end_date()
         if end_date:
             print(f"Project End Date: {end_date}")
-        self.populate_tree()
-        self.expand_all_items()
+        self.refresh_tree_values()
 
     def generate_pdf(self):
         """Generate a single PDF proposal with the Gantt chart on page 2."""
+        # Refuse before the dialog and the Gantt render, not after
+        if self._bg_busy:
+            messagebox.showinfo("Please wait", "The previous export is still running.")
+            return
         filename = filedialog.asksaveasfilename(
             defaultextension=".pdf",
             filetypes=[("PDF files", "*.pdf")],
@@ -1637,13 +2204,63 @@ class ProposalGenerator:
         if not filename: return
         
         try:
-            self.create_pdf(filename)
-            messagebox.showinfo("Success", f"Successfully generated proposal:\n{os.path.basename(filename)}")
+            build = self._prepare_pdf(filename)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
+            return
+        # Layout, writing and merging run off the UI thread so the window stays responsive
+        self._run_in_bg(
+            build,
+            lambda _: messagebox.showinfo("Success", f"Successfully generated proposal:\n{os.path.basename(filename)}"),
+            lambda e: messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}"),
+        )
+
+    def _run_in_bg(self, work, on_done, on_error):
+        """Run work() on a worker thread; on_done(result) or on_error(exc) is then called on the Tk thread.
+
+        work must not touch Tk; everything it needs is gathered beforehand.
+        """
+        if self._bg_busy:
+            messagebox.showinfo("Please wait", "The previous export is still running.")
+            return
+        self._bg_busy = True
+        self.root.config(cursor="watch")
+
+        def worker():
+            try:
+                self._result_q.put((on_done, work()))
+            except Exception as e:
+                self._result_q.put((on_error, e))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(BG_POLL_MS, self._drain_q)
 
-    def _setup_reportlab_styles(self, num_rows):
-        """Dynamically create ReportLab styles based on the number of table rows."""
+    def _on_close(self):
+        """Close the window unless a background export is still writing its file."""
+        if self._bg_busy:
+            messagebox.showinfo("Please wait", "The proposal PDF is still being written. Close the window once it has finished.")
+            return
+        self.root.destroy()
+
+    def _drain_q(self):
+        """Poll for the background job's result and hand it to its callback."""
+        try:
+            callback, value = self._result_q.get_nowait()
+        except queue.Empty:
+            self.root.after(BG_POLL_MS, self._drain_q)
+            return
+        self._bg_busy = False
+        self.root.config(cursor="")
+        callback(value)
+
+    def _setup_reportlab_styles(self):
+        """Create the ReportLab styles and column layout for the project table.
+
+        The result only depends on which fonts loaded, so it is built once and
+        reused; after a fallback to Helvetica the next PDF tries Jost again.
+        """
+        if self._reportlab_styles is not None:
+            return self._reportlab_styles
         font_size, leading, header_font_size, header_leading = 7, 9, 8, 11
         col_widths = [3.3*inch, 0.7*inch, 1.0*inch, 1.0*inch, 1.2*inch]
         header_padding, row_padding = 3, 1
@@ -1651,10 +2268,14 @@ class ProposalGenerator:
         # Font setup (using original logic)
         font_name, font_name_bold = 'Jost', 'Jost-Bold'
         try:
-            jost_regular_path = resource_path('Jost-Regular.ttf')
-            jost_bold_path = resource_path('Jost-Bold.ttf')
-            pdfmetrics.registerFont(TTFont(font_name, jost_regular_path))
-            pdfmetrics.registerFont(TTFont(font_name_bold, jost_bold_path))
+            # Registration parses the TTF files; it persists for the process,
+            # so later PDFs reuse the already registered fonts
+            registered = pdfmetrics.getRegisteredFontNames()
+            if font_name not in registered or font_name_bold not in registered:
+                jost_regular_path = resource_path('Jost-Regular.ttf')
+                jost_bold_path = resource_path('Jost-Bold.ttf')
+                pdfmetrics.registerFont(TTFont(font_name, jost_regular_path))
+                pdfmetrics.registerFont(TTFont(font_name_bold, jost_bold_path))
         except Exception as e:
             print(f"Could not load custom fonts, falling back to Helvetica. Error: {e}")
             font_name, font_name_bold = 'Helvetica', 'Helvetica-Bold'
@@ -1669,12 +2290,15 @@ class ProposalGenerator:
             'table_header_right': ParagraphStyle('table_header_style_right', parent=styles['Normal'], fontName=font_name_bold, fontSize=header_font_size, leading=header_leading, alignment=2, textColor=colors.white)
         }
         
-        return {
+        style_settings = {
             'styles': table_styles,
             'col_widths': col_widths,
             'header_padding': header_padding,
             'row_padding': row_padding
         }
+        if font_name == 'Jost':
+            self._reportlab_styles = style_settings
+        return style_settings
 
     def _create_pdf_header(self, style_settings):
 
@@ -1755,8 +2379,13 @@ class ProposalGenerator:
         return hdr
 
     def _create_table_data(self, styles):
-        """Prepare the data for the main project table."""
+        """Prepare the data for the main project table.
+
+        Returns the table rows together with the milestone BACKGROUND
+        commands for them, so _style_table need not walk the items again.
+        """
         all_table_data = []
+        milestone_commands = []
         table_text_style = styles['table_text']
         table_bold_style = styles['table_bold']
         table_bold_white_style = styles['table_bold_white']
@@ -1774,11 +2403,20 @@ class ProposalGenerator:
         all_table_data.append(header_row_formatted)
         
         # Summary row
-        total_price = sum(item.price for item in self.template_items if item.enabled.get() and item.indent_level == 0)
-        valid_dates = [datetime.strptime(dt, "%m/%d/%y") for item in self.template_items if item.enabled.get() for dt in (item.start_date, item.end_date) if dt]
-        earliest_start = min(valid_dates).strftime("%m/%d/%y") if valid_dates else ""
-        latest_end = max(valid_dates).strftime("%m/%d/%y") if valid_dates else ""
-        total_duration = self._get_business_days_between(earliest_start, latest_end)
+        total_price = 0
+        first = last = None     # date ordinals over the enabled top-level items
+        for item in self.template_items:
+            if not item.is_enabled:
+                continue
+            if item.indent_level == 0:
+                total_price += item.price
+            for o in (item._start_ordinal, item._end_ordinal):
+                if o:
+                    if first is None or o < first: first = o
+                    if last is None or o > last: last = o
+        earliest_start = date.fromordinal(first).strftime("%m/%d/%y") if first else ""
+        latest_end = date.fromordinal(last).strftime("%m/%d/%y") if last else ""
+        total_duration = self._business_days_between_ordinals(first, last)
         
         summary_row_formatted = [
             Paragraph(f"<b>{self.project_name.get()}</b>", table_bold_white_style),
@@ -1789,42 +2427,59 @@ class ProposalGenerator:
         ]
         all_table_data.append(summary_row_formatted)
 
-        # Recursive function to build all rows
-        def build_table_rows_recursive(items):
-            for item in items:
-                if item.enabled.get():
-                    is_main_milestone = item.is_milestone and item.indent_level == 0
-                    current_style = table_bold_white_style if is_main_milestone else table_bold_style if item.is_milestone else table_text_style
-                    price_style = ParagraphStyle('price_style', parent=current_style, alignment=2)
-                    name_para_style = current_style
-                    
-                    if is_main_milestone:
-                        name_text = f"<b>{'&nbsp;' * 4 * item.indent_level}{item.name}</b>"
-                        name_para_style = ParagraphStyle('main_milestone_name', parent=table_bold_white_style)
-                    elif item.is_milestone:
-                        name_text = f"<b>{'&nbsp;' * 4 * item.indent_level}{item.name}</b>"
-                        name_para_style = ParagraphStyle('sub_milestone_name', parent=table_bold_style)
-                    else:
-                        name_text = f"{'&nbsp;' * 4 * item.indent_level}{item.name}"
-
-                    name_para = Paragraph(name_text, name_para_style)
-                    row_data = [
-                        name_para,
-                        Paragraph(f"{item.duration}", current_style),
-                        Paragraph(item.start_date, current_style),
-                        Paragraph(item.end_date, current_style),
-                        Paragraph(f"${item.price:,}" if item.price > 0 else ("$0" if item.is_milestone else ""), price_style),
-                    ]
-                    all_table_data.append(row_data)
-                    
-                    if item.children:
-                        build_table_rows_recursive(item.children)
-        
-        build_table_rows_recursive(self.template_items)
-        return all_table_data
+        # One pre-order pass over the enabled items; a disabled item hides its subtree
+        main_milestone_bg = colors.HexColor("#991f2b")
+        sub_milestone_bg = colors.HexColor("#D3D3D3")
+        # (cell, name, price) styles per row kind, built once rather than per row
+        row_styles = {
+            'main': (table_bold_white_style,
+                     ParagraphStyle('main_milestone_name', parent=table_bold_white_style),
+                     ParagraphStyle('price_style', parent=table_bold_white_style, alignment=2)),
+            'milestone': (table_bold_style,
+                          ParagraphStyle('sub_milestone_name', parent=table_bold_style),
+                          ParagraphStyle('price_style', parent=table_bold_style, alignment=2)),
+            'task': (table_text_style,
+                     table_text_style,
+                     ParagraphStyle('price_style', parent=table_text_style, alignment=2)),
+        }
+        stack = list(reversed(self.template_items))
+        while stack:
+            item = stack.pop()
+            if not item.is_enabled:
+                continue
+            if item.is_milestone:
+                row_idx = len(all_table_data)
+                bg_color = main_milestone_bg if item.indent_level == 0 else sub_milestone_bg
+                milestone_commands.append(('BACKGROUND', (0, row_idx), (-1, row_idx), bg_color))
+            is_main_milestone = item.is_milestone and item.indent_level == 0
+            level = item.indent_level
+            indent = PDF_INDENTS[level] if 0 <= level < len(PDF_INDENTS) else '&nbsp;' * 4 * level
+            current_style, name_para_style, price_style = row_styles[
+                'main' if is_main_milestone else 'milestone' if item.is_milestone else 'task']
+
+            if item.is_milestone:
+                name_text = f"<b>{indent}{item.name}</b>"
+            else:
+                name_text = f"{indent}{item.name}"
+
+            name_para = Paragraph(name_text, name_para_style)
+            row_data = [
+                name_para,
+                Paragraph(f"{item.duration}", current_style),
+                Paragraph(item.start_date, current_style),
+                Paragraph(item.end_date, current_style),
+                Paragraph(item.price_text if item.price > 0 else ("$0" if item.is_milestone else ""), price_style),
+            ]
+            all_table_data.append(row_data)
+            stack.extend(reversed(item.children))
+
+        return all_table_data, milestone_commands
 
-    def _style_table(self, full_table, styles, style_settings):
-        """Apply styles to the main project table."""
+    def _style_table(self, full_table, styles, style_settings, milestone_commands=()):
+        """Apply styles to the main project table.
+
+        milestone_commands are the per-row backgrounds from _create_table_data.
+        """
         table_style_commands = [
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('TOPPADDING', (0,0), (-1,0), style_settings['header_padding']), 
@@ -1842,19 +2497,7 @@ class ProposalGenerator:
 
         ]
         
-        row_idx_offset = 2
-        def find_and_style_milestones(items, current_row_idx):
-            for item in items:
-                if item.enabled.get():
-                    if item.is_milestone:
-                        bg_color = colors.HexColor("#991f2b") if item.indent_level == 0 else colors.HexColor("#D3D3D3")
-                        table_style_commands.append(('BACKGROUND', (0, current_row_idx), (-1, current_row_idx), bg_color))
-                    current_row_idx += 1
-                    if item.children:
-                        current_row_idx = find_and_style_milestones(item.children, current_row_idx)
-            return current_row_idx
-
-        find_and_style_milestones(self.template_items, row_idx_offset)
+        table_style_commands.extend(milestone_commands)
         full_table.setStyle(TableStyle(table_style_commands))
         return full_table
 
@@ -1862,57 +2505,44 @@ class ProposalGenerator:
         """
         Creates Gantt chart and appends it to the main PDF.
         """
+        # The chart is rendered into memory and merged by the build step
+        self._gantt_buffer = None
         if not self.include_gantt.get():
             return
 
-        # Store the main PDF filename for later merging
-        main_pdf = getattr(self, '_current_pdf_name', 'proposal.pdf')
-        self._gantt_temp_file = f"{main_pdf[:-4]}_temp_gantt.pdf"
-        
         # Collect task data in testgantt.py format
         rows = []
-        def collect_tasks_recursive(items):
-            for item in items:
-                if item.enabled.get() and item.start_date and item.end_date:
-                    try:
-                        start_dt = datetime.strptime(item.start_date, "%m/%d/%y")
-                        end_dt = datetime.strptime(item.end_date, "%m/%d/%y")
-                        
-                        # Determine kind based on item properties
-                        if item.is_milestone:
-                            kind = "summary"
-                        elif item.children:
-                            kind = "summary" 
-                        else:
-                            kind = "task"
-                        
-                        rows.append({
-                            "name": item.name,
-                            "start": start_dt,
-                            "finish": end_dt,
-                            "kind": kind,
-                        })
-                    except (ValueError, TypeError):
-                        continue
-                if item.children:
-                    collect_tasks_recursive(item.children)
-
-        collect_tasks_recursive(self.template_items)
+        stack = list(reversed(self.template_items))
+        while stack:
+            item = stack.pop()
+            if item.is_enabled and item.start_date and item.end_date:
+                # Parsed once by the date setters; an unparseable date skips
+                # the row and its subtree
+                if item._start_ordinal is None or item._end_ordinal is None:
+                    continue
+                rows.append({
+                    "name": item.name,
+                    "start": datetime.fromordinal(item._start_ordinal),
+                    "finish": datetime.fromordinal(item._end_ordinal),
+                    "kind": "summary" if item.is_milestone or item.children else "task",
+                })
+            stack.extend(reversed(item.children))
 
         if not rows:
             return
 
         try:
-            # Create temporary Gantt PDF
+            gantt_buffer = BytesIO()
             build_gantt_with_version(
             rows=rows, 
-            out_pdf=self._gantt_temp_file, 
+            out_pdf=gantt_buffer, 
             title="Project Schedule",
             project_title=self.project_name.get(),
             customer_name=self.company_name.get(),
             logo_path=self.logo_path.get() if os.path.exists(self.logo_path.get()) else "",
             version=self.version.get()  # Add this line
         )
+            self._gantt_buffer = gantt_buffer
         except Exception as e:
             print(f"Error creating Gantt chart: {e}")
         
@@ -1927,39 +2557,30 @@ class ProposalGenerator:
         Identical header placement on all portrait pages + visible bottom rule at page break.
         No other layout changes.
         """
-        from io import BytesIO
-        from reportlab.pdfgen.canvas import Canvas
-        self._current_pdf_name = filename  # Add this line at the start
+        self._prepare_pdf(filename)()
+
+    def _prepare_pdf(self, filename):
+        """
+        Gather everything create_pdf needs from the UI and return a callable that
+        builds and writes the document without touching Tk.
+        """
+        # With a Gantt page the proposal is built in memory and merged before
+        # the single write to filename; otherwise it is written directly
+        main_buffer = BytesIO() if self.include_gantt.get() else None
 
         doc = BaseDocTemplate(
-            filename,
+            main_buffer if main_buffer is not None else filename,
             topMargin=0.5*inch, bottomMargin=0.4*inch,
             leftMargin=0.3*inch, rightMargin=0.3*inch
         )
 
-        # Count rows (unchanged)
-        def count_enabled_items(items):
-            count = 0
-            for item in items:
-                if item.enabled.get():
-                    count += 1
-                    if item.children:
-                        count += count_enabled_items(item.children)
-            return count
-
-        num_rows = count_enabled_items(self.template_items) + 2
-
         # Styles (unchanged)
-        style_settings = self._setup_reportlab_styles(num_rows)
+        style_settings = self._setup_reportlab_styles()
         spacer_h = 0.2*inch
 
-        # --- Measure header height exactly, using the same header you already build ---
+        # --- Build and measure the header once; every portrait page reuses it ---
         hdr = self._create_pdf_header(style_settings)
-
-        tmp_buf = BytesIO()
-        tmp_canv = Canvas(tmp_buf, pagesize=letter)
-        _, hdr_h = hdr.wrapOn(tmp_canv, doc.width, doc.topMargin)  # exact height used by drawOn
-        tmp_canv.save()
+        _, hdr_h = hdr.wrap(doc.width, doc.topMargin)  # exact height used by drawOn
 
         # Reserve space (header + spacer) in the frame on *all* portrait pages
         reserved_top = hdr_h + spacer_h
@@ -1981,18 +2602,19 @@ class ProposalGenerator:
             id='landscape_frame'
         )
 
-        # Footer (unchanged)
+        # Footer (unchanged); the text is built once here because pages are
+        # drawn off the UI thread and every page shows the same date and version
+        version  = (self.version.get() or "V1").strip()
+        footer_text = f"{datetime.now().strftime('%B %d, %Y')} - {version}"
         def _draw_footer(canv, _doc):
             canv.saveState()
-            date_str = datetime.now().strftime("%B %d, %Y")
-            version  = (self.version.get() or "V1").strip()
             canv.setFont("Helvetica", 8)
-            canv.drawString(doc.leftMargin + 0.3*inch, 0.08*inch, f"{date_str} - {version}")
+            canv.drawString(doc.leftMargin + 0.3*inch, 0.08*inch, footer_text)
             canv.restoreState()
 
         # Header (canvas) + bottom rule at frame edge on every portrait page
         def _on_portrait_page(canv, _doc):
-            self._draw_header_on_canvas(canv, _doc, style_settings)  # identical position every time
+            self._draw_header_on_canvas(canv, _doc, hdr, hdr_h)  # identical position every time
             _draw_footer(canv, _doc)
 
         def _on_portrait_page_end(canv, _doc):
@@ -2022,29 +2644,42 @@ class ProposalGenerator:
         # IMPORTANT: header is no longer in the story on page 1; we draw it on the canvas
         # for identical placement across pages. We keep the same table and styling.
 
-        table_data = self._create_table_data(style_settings['styles'])
+        table_data, milestone_commands = self._create_table_data(style_settings['styles'])
         full_table = Table(table_data, colWidths=style_settings['col_widths'], repeatRows=1)
-        full_table = self._style_table(full_table, style_settings['styles'], style_settings)
+        full_table = self._style_table(full_table, style_settings['styles'], style_settings, milestone_commands)
 
         # Keep whole rows; no padding tweaks
         full_table.splitByRow = 1
+        # Measure every row once and pin the heights; otherwise each page's
+        # wrap() and split() re-measure the remaining rows' paragraphs, and
+        # the split-off pieces inherit the pinned heights
+        full_table.wrap(doc.width, float("inf"))
+        full_table._argH = list(full_table._rowHeights)
 
         elements.append(full_table)
 
         # Optional Gantt (unchanged)
         
-        self._add_gantt_page(elements, getSampleStyleSheet())
+        self._add_gantt_page(elements, style_settings['styles'])
 
-        doc.build(elements)
-        # If Gantt was created, merge it
-        if self.include_gantt.get() and hasattr(self, '_gantt_temp_file') and os.path.exists(self._gantt_temp_file):
+        gantt_buffer = self._gantt_buffer
+
+        def build():
+            doc.build(elements)
+            if main_buffer is None:
+                return
+            # If Gantt was created, merge it
+            if gantt_buffer is not None:
                 try:
-                    self._merge_pdfs(filename, self._gantt_temp_file, filename)
-                    # Clean up temp file
-                    os.remove(self._gantt_temp_file)
+                    self._merge_pdfs(main_buffer, gantt_buffer, filename)
                     print("Gantt chart appended to main PDF")
+                    return
                 except Exception as e:
                     print(f"Error merging Gantt chart: {e}")
+            with open(filename, 'wb') as f:
+                f.write(main_buffer.getvalue())
+
+        return build
 
 
 
@@ -2060,10 +2695,11 @@ class ProposalGenerator:
             return
 
         try:
-            wb = Workbook()
+            # Write-only mode streams rows to disk instead of keeping a Cell
+            # object per value; widths must be set before the first append
+            wb = Workbook(write_only=True)
             # Sheet 1: Project Info
-            info_ws = wb.active
-            info_ws.title = "Project Info"
+            info_ws = wb.create_sheet(title="Project Info")
             
             logo_path_to_save = self.logo_path.get()
             if logo_path_to_save == self.default_logo_path:
@@ -2078,59 +2714,81 @@ class ProposalGenerator:
                 "Last Task ID": self.task_counter
             }
 
-            info_ws.append(["Attribute", "Value"])
-            for key, value in project_data.items():
-                info_ws.append([key, value])
-            
             # Style the info sheet
-            info_ws['A1'].font = Font(bold=True)
-            info_ws['B1'].font = Font(bold=True)
             info_ws.column_dimensions['A'].width = 20
             info_ws.column_dimensions['B'].width = 50
+            info_ws.append([self._bold_cell(info_ws, "Attribute"), self._bold_cell(info_ws, "Value")])
+            for key, value in project_data.items():
+                info_ws.append([key, value])
 
             # Sheet 2: Tasks
             tasks_ws = wb.create_sheet(title="Tasks")
-            headers = [
-                "ID", "Name", "Duration", "Price", "Is Milestone", "Indent Level",
-                "Enabled", "Predecessor ID", "Lag", "Is Start Pinned", "Parent ID"
-            ]
-            tasks_ws.append(headers)
-            for cell in tasks_ws[1]:
-                cell.font = Font(bold=True)
-
-            # Flatten the hierarchical data
-            flat_tasks = []
-            def _flatten_items(items, parent_id=None):
-                for item in items:
-                    flat_tasks.append({
-                        "ID": item.id, "Name": item.name, "Duration": item.duration,
-                        "Price": item.price, "Is Milestone": item.is_milestone,
-                        "Indent Level": item.indent_level, "Enabled": item.enabled.get(),
-                        "Predecessor ID": item.predecessor_id, "Lag": item.lag,
-                        "Is Start Pinned": item.is_start_pinned, "Parent ID": parent_id
-                    })
-                    if item.children:
-                        _flatten_items(item.children, parent_id=item.id)
-            
-            _flatten_items(self.template_items)
-
-            # Write tasks to sheet
-            for task in flat_tasks:
-                row = [task.get(h) for h in headers]
-                tasks_ws.append(row)
-            
+            headers = TEMPLATE_TASK_HEADERS
             # Auto-size columns for tasks sheet
             for col_idx, header in enumerate(headers, 1):
                 column_letter = get_column_letter(col_idx)
                 tasks_ws.column_dimensions[column_letter].width = max(15, len(header) + 2)
+            tasks_ws.append([self._bold_cell(tasks_ws, header) for header in headers])
 
+            # Flatten the hierarchy depth-first (parents before children) into
+            # tuples that follow the header order above, streaming each row to
+            # the sheet as it is produced; the list is kept for the JSON sidecar
+            flat_tasks = []
+            stack = [(item, None) for item in reversed(self.template_items)]
+            while stack:
+                item, parent_id = stack.pop()
+                row = (
+                    item.id, item.name, item.duration, item.price, item.is_milestone,
+                    item.indent_level, item.is_enabled, item.predecessor_id, item.lag,
+                    item.is_start_pinned, parent_id
+                )
+                tasks_ws.append(row)
+                flat_tasks.append(row)
+                stack.extend((child, item.id) for child in reversed(item.children))
 
             wb.save(filename)
+            self._write_template_cache(filename, project_data, headers, flat_tasks)
             messagebox.showinfo("Success", "Excel template saved successfully!")
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save Excel template: {str(e)}")
 
+    @staticmethod
+    def _bold_cell(ws, value):
+        """A bold header cell for a write-only worksheet."""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = Font(bold=True)
+        return cell
+
+    def _write_template_cache(self, filename, project_data, headers, flat_tasks):
+        """Write a JSON sidecar next to the .xlsx so reloads can skip openpyxl.
+
+        The sidecar records the saved workbook's (mtime_ns, size) and is only
+        used while the workbook still matches it exactly.
+        """
+        try:
+            st = os.stat(filename)
+            with open(filename + TEMPLATE_CACHE_SUFFIX, "w", encoding="utf-8") as f:
+                json.dump({"workbook": [st.st_mtime_ns, st.st_size],
+                           "project": project_data, "columns": headers, "tasks": flat_tasks}, f)
+        except (OSError, TypeError, ValueError):
+            pass  # The cache is optional; the workbook is the source of truth
+
+    def _read_template_cache(self, filename):
+        """Return (project_data, tasks_df) from a fresh sidecar, or None if missing/stale."""
+        cache_path = filename + TEMPLATE_CACHE_SUFFIX
+        try:
+            st = os.stat(filename)
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            # Any other workbook, even an older copy with a newer-looking sidecar, is reparsed
+            if cached.get("workbook") != [st.st_mtime_ns, st.st_size]:
+                return None
+            df = pd.DataFrame(cached["tasks"], columns=cached["columns"]).astype(TEMPLATE_TASK_DTYPES)
+            return cached["project"], df
+        except (OSError, AttributeError, KeyError, TypeError, ValueError):
+            return None
+
     # --- MODIFICATION: Replaced load_template with load_template_excel ---
     def load_template_excel(self):
         """Load a template from an Excel file."""
@@ -2142,11 +2800,19 @@ class ProposalGenerator:
             return
 
         try:
-            wb = load_workbook(filename)
-            
-            # Load Project Info
-            info_ws = wb["Project Info"]
-            project_data = {row[0]: row[1] for row in info_ws.iter_rows(min_row=2, values_only=True)}
+            # Prefer the JSON sidecar written on save; fall back to the workbook
+            cached = self._read_template_cache(filename)
+            if cached:
+                project_data, df = cached
+            else:
+                wb = load_workbook(filename)
+
+                # Load Project Info
+                info_ws = wb["Project Info"]
+                project_data = {row[0]: row[1] for row in info_ws.iter_rows(min_row=2, values_only=True)}
+
+                # Load Tasks with vectorized casts
+                df = pd.read_excel(wb, sheet_name="Tasks", engine="openpyxl", dtype=TEMPLATE_TASK_DTYPES)
 
             self.project_name.set(project_data.get("Project Name", ""))
             self.company_name.set(project_data.get("Company Name", ""))
@@ -2160,49 +2826,60 @@ class ProposalGenerator:
                 self.logo_path.set(saved_logo_path)
             self.client_logo_path.set(project_data.get("Client Logo Path", ""))
 
-            # Load Tasks and reconstruct hierarchy
-            tasks_ws = wb["Tasks"]
-            headers = [cell.value for cell in tasks_ws[1]]
-            
+            # Rows are unpacked positionally below, so check the layout once up front
+            if list(df.columns[:len(TEMPLATE_TASK_HEADERS)]) != TEMPLATE_TASK_HEADERS:
+                raise ValueError("Tasks sheet columns do not match the template layout")
+
+            # Normalize task columns and reconstruct hierarchy
+            df["Name"] = df["Name"].fillna("").astype(str)
+            df["Duration"] = np.ceil(df["Duration"].fillna(0)).astype("int64")
+            for col in ("Price", "Indent Level", "Lag", "Predecessor ID", "Parent ID"):
+                df[col] = df[col].fillna(0).astype("int64")
+            for col in ("Is Milestone", "Enabled", "Is Start Pinned"):
+                df[col] = df[col].fillna(False).astype(bool)
+
+            # Saved rows are parent-before-child, so parents are normally
+            # wired as rows are read; a row whose parent comes later waits
             items_by_id = {}
-            all_items_data = []
+            root_items = []
+            late_children = []
 
-            for row in tasks_ws.iter_rows(min_row=2, values_only=True):
-                item_data = dict(zip(headers, row))
-                all_items_data.append(item_data)
-                
-                item_id = int(item_data["ID"])
+            # object dtype so the tuples carry plain Python ints/bools
+            for (item_id, name, duration, price, is_milestone, indent_level,
+                 enabled, pred_id, lag, pinned, parent_id) in df[TEMPLATE_TASK_HEADERS].astype(object).itertuples(index=False, name=None):
                 item = ProposalItem(
-                    name=item_data["Name"],
-                    duration=math.ceil(float(item_data.get("Duration", 0))),
-                    price=int(item_data.get("Price", 0)),
-                    is_milestone=bool(item_data.get("Is Milestone")),
-                    indent_level=int(item_data.get("Indent Level", 0)),
-                    item_id=item_id
+                    name=name,
+                    duration=duration,
+                    price=price,
+                    is_milestone=is_milestone,
+                    indent_level=indent_level,
+                    item_id=item_id,
+                    enabled=enabled
                 )
-                item.enabled.set(bool(item_data.get("Enabled", True)))
-                pred_id = item_data.get("Predecessor ID")
-                item.predecessor_id = int(pred_id) if pred_id is not None else None
-                item.lag = int(item_data.get("Lag", 0))
-                item.is_start_pinned = bool(item_data.get("Is Start Pinned", False))
-                
+                item.predecessor_id = pred_id or None
+                item.lag = lag
+                item.is_start_pinned = pinned
+
                 items_by_id[item_id] = item
 
-            # Rebuild the tree structure
-            root_items = []
-            for item_data in all_items_data:
-                item_id = int(item_data["ID"])
-                parent_id_val = item_data.get("Parent ID")
-                parent_id = int(parent_id_val) if parent_id_val is not None else None
-                
-                current_item = items_by_id[item_id]
-                
-                if parent_id in items_by_id:
-                    parent_item = items_by_id[parent_id]
-                    parent_item.children.append(current_item)
-                    current_item.parent = parent_item
+                parent_item = items_by_id.get(parent_id)
+                if parent_item is not None:
+                    parent_item.children.append(item)
+                    item.parent = parent_item
+                elif parent_id:
+                    late_children.append((item, parent_id))
+                else:
+                    root_items.append(item)
+
+            # Only hand-edited files get here: attach to parents that appeared
+            # later, and keep rows whose parent is missing at the top level
+            for item, parent_id in late_children:
+                parent_item = items_by_id.get(parent_id)
+                if parent_item is not None:
+                    parent_item.children.append(item)
+                    item.parent = parent_item
                 else:
-                    root_items.append(current_item)
+                    root_items.append(item)
 
             self.template_items = root_items
             self.populate_tree()
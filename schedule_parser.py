@@ -1,19 +1,32 @@
+import copy
+import functools
+import math
+import os
+import re
 import sys
+from dataclasses import dataclass
 from datetime import datetime
-from tkinter import messagebox
+from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 
-# --- MODIFICATION: Added import for openpyxl ---
-try:
-    from openpyxl import Workbook, load_workbook
-    from openpyxl.styles import Font
-    from openpyxl.utils import get_column_letter
-except ImportError:
-    messagebox.showerror("Missing Dependency", "The 'openpyxl' library is required to work with Excel files. Please install it using: pip install openpyxl")
-    sys.exit()
+# The generator (and with it Tk, ReportLab and openpyxl) is only imported when
+# rows are pushed into it, so parsing a workbook stays a pandas-only import
+if TYPE_CHECKING:
+    from proposal_generator import ProposalGenerator
+
+
+def _require_openpyxl():
+    """pandas reads .xlsx through openpyxl; stop with the usual message if it is missing."""
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        from tkinter import messagebox
+        messagebox.showerror("Missing Dependency", "The 'openpyxl' library is required to work with Excel files. Please install it using: pip install openpyxl")
+        sys.exit()
+
 
-from proposal_generator import ProposalItem, ProposalGenerator
 # Parsing & Build Rules
 # ===================
 
@@ -21,16 +34,53 @@ EXACT_SUBTOTAL_LABELS = {
     "civil engineering", "electrical engineering", "structural engineering", "substation engineering"
 }
 
+# Proposal Page labels that open a category block (now includes Substation & BESS)
+CATEGORY_HEADERS = frozenset({
+    "civil engineering",
+    "electrical engineering",
+    "structural engineering",
+    "substation engineering",
+    "bess",
+    "bess engineering",
+    "battery energy storage",
+    "battery energy storage system",
+})
+
+# Any of these inside a Proposal Page label marks a total/heading, not a task
+SKIP_KEYWORDS_RE = re.compile("total|milestone|summary of services|engineering proposal|insurance adder")
+
+STRUCTURAL_HEADER_RE = re.compile(r"\bstruct\w*\s+engineering\b", re.I)
+LABEL_PUNCT_RE = re.compile(r"[\s:()/_-]+")
+
+# (task, price) column pairs on Proposal Page. Includes D/E explicitly.
+PROPOSAL_COLUMN_PAIRS = ((0, 1), (3, 4), (6, 7), (9, 10), (10, 11))
+
 PHASES = ["30%", "60%", "90%", "IFC"]
+DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%B %d, %Y", "%b %d, %Y")
 
 
-def _pairs(ncols: int):
-    """(task, price) column pairs on Proposal Page. Includes D/E explicitly."""
-    return [(0, 1), (3, 4), (6, 7), (9, 10), (10, 11)]
+@dataclass(slots=True)
+class TemplateRow:
+    """One row of the flattened task tree handed to ProposalGenerator."""
+    id: int
+    name: str
+    duration: int
+    price: int
+    is_milestone: bool
+    indent_level: int
+    enabled: bool
+    predecessor_id: int | None
+    lag: int
+    is_start_pinned: bool
+    parent_id: int | None
 
 
 def _categorize(text: str) -> str:
-    t = (text or "").lower().strip()
+    return _categorize_low((text or "").lower().strip())
+
+
+def _categorize_low(t: str) -> str:
+    """_categorize for a label that is already lowercased and stripped."""
     if t.startswith("civil"): return "Civil"
     if t.startswith("electrical"): return "Electrical"
     if t.startswith("structural"): return "Structural"
@@ -43,7 +93,11 @@ def _categorize(text: str) -> str:
 
 
 def _infer_phase(text: str):
-    t = (text or "").lower()
+    return _infer_phase_low((text or "").lower())
+
+
+def _infer_phase_low(t: str):
+    """_infer_phase for a label that is already lowercased."""
     if "30% design" in t or "30%" in t: return "30%"
     if "60% design" in t or "60%" in t: return "60%"
     if "90% design" in t or "90%" in t: return "90%"
@@ -51,58 +105,48 @@ def _infer_phase(text: str):
     return None
 
 
-def load_proposal_page_rows(path: str):
-    pp = pd.read_excel(path, sheet_name="Proposal Page", header=None, engine="openpyxl")
+def load_proposal_page_rows(pp: pd.DataFrame):
     props = []
-    ncols = pp.shape[1]
+    nrows, ncols = pp.shape
+    arr = pp.to_numpy(dtype=object)
 
     def normalize(s):
         return (s or "").strip()
 
-    for (txt_col, price_col) in _pairs(ncols):
+    def column(c):
+        return arr[:, c].tolist() if c < ncols else [None] * nrows
+
+    for (txt_col, price_col) in PROPOSAL_COLUMN_PAIRS:
         current_phase = None
         current_category = None  # tracks the most recent category header
 
-        for i in range(pp.shape[0]):
-            txt = pp.iat[i, txt_col] if txt_col < ncols else None
-            val = pp.iat[i, price_col] if price_col < ncols else None
+        for txt, val in zip(column(txt_col), column(price_col)):
+            if not isinstance(txt, str):
+                continue
+            low = txt.lower().strip()
 
             # Phase detection
-            if isinstance(txt, str):
-                maybe = _infer_phase(txt)
-                if maybe:
-                    current_phase = maybe
-
-                # Category header detection (now includes Substation & BESS)
-                low = txt.lower().strip()
-                if low in (
-                    "civil engineering",
-                    "electrical engineering",
-                    "structural engineering",
-                    "substation engineering",
-                    "bess",
-                    "bess engineering",
-                    "battery energy storage",
-                    "battery energy storage system",
-                ):
-                    if "bess" in low or "battery energy storage" in low:
-                        current_category = "BESS"
-                    elif low.startswith("substation"):
-                        current_category = "Substation"
-                    else:
-                        # "Civil Engineering" -> "Civil", etc.
-                        current_category = txt.split()[0].capitalize()
-                    continue  # header row itself isn't a task
+            maybe = _infer_phase_low(low)
+            if maybe:
+                current_phase = maybe
+
+            # Category header detection
+            if low in CATEGORY_HEADERS:
+                if "bess" in low or "battery energy storage" in low:
+                    current_category = "BESS"
+                elif low.startswith("substation"):
+                    current_category = "Substation"
+                else:
+                    # "Civil Engineering" -> "Civil", etc.
+                    current_category = txt.split()[0].capitalize()
+                continue  # header row itself isn't a task
 
             # Candidate task row with a numeric price
-            if isinstance(txt, str) and normalize(txt) and pd.notna(val):
-                lower = txt.lower().strip()
+            if low and pd.notna(val):
                 # Skip totals/headers/etc.
-                if any(k in lower for k in [
-                    "total", "milestone", "summary of services", "engineering proposal", "insurance adder"
-                ]):
+                if SKIP_KEYWORDS_RE.search(low):
                     continue
-                if lower in EXACT_SUBTOTAL_LABELS:
+                if low in EXACT_SUBTOTAL_LABELS:
                     continue
 
                 # price
@@ -112,7 +156,7 @@ def load_proposal_page_rows(path: str):
                     continue
 
                 # Category assignment: explicit on the row, else the last seen header
-                cat = _categorize(txt) or current_category or ""
+                cat = _categorize_low(low) or current_category or ""
                 if not cat:
                     continue
 
@@ -120,35 +164,46 @@ def load_proposal_page_rows(path: str):
                     "category": cat,
                     "task": normalize(txt),
                     "proposal_price": price,
-                    "phase": current_phase or _infer_phase(txt) or "30%",
+                    # a phase found on this row is already in current_phase
+                    "phase": current_phase or "30%",
                 })
     return props
 
 
 
 
-def _load_detail_map(path: str, sheet: str):
-    """Return {Description: {hours, price}}; dedupe by keeping first priced/max price."""
+def _price_value(price):
+    """Cell value → float price; blanks, "Not Included" and junk give 0.0."""
+    if isinstance(price, (int, float)):
+        return 0.0 if math.isnan(price) else float(price)
+    if price is None or pd.isna(price):
+        return 0.0
+    if isinstance(price, str) and price.strip().lower() == "not included":
+        return 0.0
     try:
-        df = pd.read_excel(path, sheet_name=sheet, header=None, engine="openpyxl")
+        return float(price)
     except Exception:
-        return {}
-    df2 = df.iloc[12:].reset_index(drop=True)  # after header row (index 11)
+        return 0.0
+
+
+def _detail_columns(df: pd.DataFrame, start: int = 0):
+    """(description, hours, cost) tuples per sheet row from `start`; missing columns read as None."""
     DESC, HRS, COST = 2, 11, 12
+    n = max(len(df) - start, 0)
+    cols = [df.iloc[start:, c].tolist() if c < df.shape[1] else [None] * n for c in (DESC, HRS, COST)]
+    return zip(*cols)
+
+
+def _load_detail_map(df: pd.DataFrame):
+    """Return {Description: {hours, price}}; dedupe by keeping first priced/max price."""
+    if df is None:
+        return {}
     out = {}
-    for _, row in df2.iterrows():
-        desc = row.iloc[DESC] if len(row) > DESC else None
-        hours = row.iloc[HRS] if len(row) > HRS else None
-        price = row.iloc[COST] if len(row) > COST else None
+    for desc, hours, price in _detail_columns(df, 12):  # after header row (index 11)
         if isinstance(desc, str) and desc.strip():
             name = desc.strip()
             h = float(hours) if pd.notna(hours) else 0.0
-            p = 0.0
-            if pd.notna(price) and str(price).strip().lower() != "not included":
-                try:
-                    p = float(price)
-                except Exception:
-                    p = 0.0
+            p = _price_value(price)
             if name not in out:
                 out[name] = {"hours": h, "price": p}
             else:
@@ -157,102 +212,62 @@ def _load_detail_map(path: str, sheet: str):
                     out[name] = {"hours": h, "price": p}
     return out
 
-def _load_structural_from_electrical(path: str, sheet: str = "Electrical"):
+def _load_structural_from_electrical(df: pd.DataFrame):
     """
     Parse the 'Structural Engineering' section that lives inside the Electrical sheet.
     Returns: {task_name: {"hours": float, "price": float}}
     """
-    try:
-        df = pd.read_excel(path, sheet_name=sheet, header=None, engine="openpyxl")
-    except Exception:
+    if df is None:
         return {}
 
     out = {}
-    DESC, HRS, COST = 2, 11, 12
-
-    # Find the section header (handles misspelling 'Structrural Engineering')
-    header_row = None
-    for i in range(len(df)):
-        row = df.iloc[i]
-        if any(isinstance(v, str) and re.search(r"\bstruct\w*\s+engineering\b", v, re.I) for v in row.tolist()):
-            header_row = i
-            break
-    if header_row is None:
-        return {}
-
-    # Collect rows until a new major section / stage total
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i]
-        desc = row.iloc[DESC] if len(row) > DESC else None
-        if isinstance(desc, str) and desc.strip():
+    in_block = None  # None until the section header is seen, then True until the block ends
+
+    for row, (desc, hours, price) in zip(df.itertuples(index=False, name=None), _detail_columns(df)):
+        if in_block is None:
+            # Find the section header (handles misspelling 'Structrural Engineering')
+            if any(isinstance(v, str) and STRUCTURAL_HEADER_RE.search(v) for v in row):
+                in_block = True
+        elif in_block and isinstance(desc, str) and desc.strip():
+            # Collect rows until a new major section / stage total
             low = desc.lower().strip()
             if "stage total" in low or any(k in low for k in ["substation", "bess", "additional services"]):
-                break
+                in_block = False
             # skip echoed header lines like "Structural Engineering"
-            if re.search(r"\bstruct\w*\s+engineering\b", low):
+            elif not STRUCTURAL_HEADER_RE.search(low):
+                out[desc.strip()] = {"hours": float(hours) if pd.notna(hours) else 0.0, "price": _price_value(price)}
                 continue
 
-            hours = row.iloc[HRS] if len(row) > HRS else None
-            price = row.iloc[COST] if len(row) > COST else None
-            h = float(hours) if pd.notna(hours) else 0.0
-            p = 0.0
-            if pd.notna(price) and str(price).strip().lower() != "not included":
-                try:
-                    p = float(price)
-                except Exception:
-                    p = 0.0
-            out[desc.strip()] = {"hours": h, "price": p}
-
-    # Ensure we also capture a standalone "Structural Plan Set" if it appears outside the block
-    for _, row in df.iterrows():
-        desc = row.iloc[DESC] if len(row) > DESC else None
+        # Ensure we also capture a standalone "Structural Plan Set" if it appears outside the block
         if isinstance(desc, str) and "structural plan set" in desc.lower():
-            hours = row.iloc[HRS] if len(row) > HRS else None
-            price = row.iloc[COST] if len(row) > COST else None
             h = float(hours) if pd.notna(hours) else 0.0
-            p = 0.0
-            if pd.notna(price) and str(price).strip().lower() != "not included":
-                try:
-                    p = float(price)
-                except Exception:
-                    p = 0.0
+            p = _price_value(price)
             out[desc.strip()] = {"hours": h, "price": p}
 
-    return out
-def _load_design_phase_rows(path: str, prefix: str, sheet: str = "Electrical"):
+    return out if in_block is not None else {}
+def _load_design_phase_rows(df: pd.DataFrame, prefix: str):
     """
     Pull phase-level rows like 'Substation 60% - Design', 'Substation IFC - Design',
     or 'BESS 60% - Design' from the Electrical sheet.
     Returns: {task_name: {"hours": float, "price": float}}
     """
-    try:
-        df = pd.read_excel(path, sheet_name=sheet, header=None, engine="openpyxl")
-    except Exception:
+    if df is None:
         return {}
 
     out = {}
-    DESC, HRS, COST = 2, 11, 12
     pref = prefix.lower() + " "
 
-    for _, row in df.iterrows():
-        desc = row.iloc[DESC] if len(row) > DESC else None
+    for desc, hours, price in _detail_columns(df):
         if isinstance(desc, str) and desc.strip():
             name = desc.strip()
             low = name.lower()
             # e.g., "Substation 60% - Design", "Substation IFC - Design", "BESS 60% - Design"
             if low.startswith(pref) and "- design" in low:
-                hours = row.iloc[HRS] if len(row) > HRS else None
-                price = row.iloc[COST] if len(row) > COST else None
                 h = float(hours) if pd.notna(hours) else 0.0
-                p = 0.0
-                if pd.notna(price) and str(price).strip().lower() != "not included":
-                    try:
-                        p = float(price)
-                    except Exception:
-                        p = 0.0
+                p = _price_value(price)
                 out[name] = {"hours": h, "price": p}
     return out
-def enrich_with_details(path: str, rows):
+def enrich_with_details(sheets: dict, rows):
     """
     Attach 'hours' and 'detail_price' to each row by looking up the detail sheets.
     - Electrical tasks: from Electrical sheet
@@ -261,44 +276,38 @@ def enrich_with_details(path: str, rows):
     - Substation tasks: primarily from Civil sheet (e.g., 'Substation Pad Design - Civ. ...')
     - BESS tasks:       primarily from Electrical sheet (e.g., 'BESS 60% - Design')
     """
-    xl = pd.ExcelFile(path, engine="openpyxl")
-    civil_map = _load_detail_map(path, "Civil") if "Civil" in xl.sheet_names else {}
-    elec_map  = _load_detail_map(path, "Electrical") if "Electrical" in xl.sheet_names else {}
-    structural_from_elec = _load_structural_from_electrical(path)
+    civil_map = _load_detail_map(sheets.get("Civil"))
+    elec_map  = _load_detail_map(sheets.get("Electrical"))
+    structural_from_elec = _load_structural_from_electrical(sheets.get("Electrical"))
 
     # Helper: tolerant key lookup (handles stray spaces, minor punctuation)
-    import re
     def _norm(s: str) -> str:
         return re.sub(r"\s+", " ", (s or "").strip().lower())
 
     # Precompute normalized maps for fallback matching
-    civil_norm = { _norm(k): v for k, v in civil_map.items() }
-    elec_norm  = { _norm(k): v for k, v in elec_map.items() }
-    struc_norm = { _norm(k): v for k, v in structural_from_elec.items() }
+    civil = (civil_map, { _norm(k): v for k, v in civil_map.items() })
+    elec  = (elec_map, { _norm(k): v for k, v in elec_map.items() })
+    struc = (structural_from_elec, { _norm(k): v for k, v in structural_from_elec.items() })
+
+    # Sheets to search per category, in order; each tried exact, then normalized
+    sources_by_cat = {
+        "Electrical": (elec,),
+        "Civil": (civil,),
+        "Structural": (struc,),
+        "Substation": (civil, elec),  # Substation Pad Design rows live on the Civil sheet
+        "BESS": (elec, civil),        # BESS 60% - Design lives on the Electrical sheet
+    }
 
     for r in rows:
         cat  = (r.get("category") or "").strip()
         task = (r.get("task") or "").strip()
         key  = _norm(task)
 
-        # Primary source by category
-        if cat == "Electrical":
-            d = elec_map.get(task) or elec_map.get(task.strip()) or elec_norm.get(key, {})
-        elif cat == "Civil":
-            d = civil_map.get(task) or civil_map.get(task.strip()) or civil_norm.get(key, {})
-        elif cat == "Structural":
-            d = (structural_from_elec.get(task) or structural_from_elec.get(task.strip())
-                 or struc_norm.get(key, {}))
-        elif cat == "Substation":
-            # Substation Pad Design rows live on the Civil sheet
-            d = (civil_map.get(task) or civil_map.get(task.strip()) or civil_norm.get(key, {})
-                 or elec_map.get(task) or elec_map.get(task.strip()) or elec_norm.get(key, {}))
-        elif cat == "BESS":
-            # BESS 60% - Design lives on the Electrical sheet
-            d = (elec_map.get(task) or elec_map.get(task.strip()) or elec_norm.get(key, {})
-                 or civil_map.get(task) or civil_map.get(task.strip()) or civil_norm.get(key, {}))
-        else:
-            d = {}
+        d = {}
+        for exact, normed in sources_by_cat.get(cat, ()):
+            d = exact.get(task) or normed.get(key, {})
+            if d:
+                break
 
         r["hours"] = float(d.get("hours")) if d.get("hours") is not None else None
         r["detail_price"] = float(d.get("price")) if d.get("price") is not None else None
@@ -306,7 +315,7 @@ def enrich_with_details(path: str, rows):
     return rows
 
 
-def extract_project_info(path: str):
+def extract_project_info(df: pd.DataFrame):
     """
     Robustly scan the 'Proposal Page' for:
       - date
@@ -316,7 +325,6 @@ def extract_project_info(path: str):
       - state
       - size_mw  (numeric if possible; otherwise raw string)
     """
-    df = pd.read_excel(path, sheet_name="Proposal Page", header=None, engine="openpyxl")
     info = {"date": None, "client": None, "project": None, "location": None, "state": None, "size_mw": None}
 
     # Keep the old fixed-cell fallbacks if they still apply
@@ -342,22 +350,19 @@ def extract_project_info(path: str):
     }
 
     def norm_label(s: str) -> str:
-        return re.sub(r"[\s:()/_-]+", "", s.lower())
+        return LABEL_PUNCT_RE.sub("", s.lower())
 
-    variants = {k: {norm_label(v) for v in vals} for k, vals in label_map.items()}
+    label_to_field = {norm_label(v): field for field, vals in label_map.items() for v in vals}
     found = {}
 
-    for r in range(max_rows):
-        for c in range(max_cols - 1):
-            cell = df.iat[r, c]
+    block = df.iloc[:max_rows, :max_cols].to_numpy(dtype=object).tolist()
+    for cells in block:
+        for cell, val in zip(cells, cells[1:]):
             if not isinstance(cell, str):
                 continue
-            key = norm_label(cell)
-            for field, opts in variants.items():
-                if key in opts:
-                    val = df.iat[r, c + 1] if (c + 1) < df.shape[1] else None
-                    if pd.notna(val) and field not in found:
-                        found[field] = val
+            field = label_to_field.get(norm_label(cell))
+            if field is not None and field not in found and pd.notna(val):
+                found[field] = val
 
     # Merge discovered values
     for k in ("date", "client", "project", "location", "state"):
@@ -381,8 +386,29 @@ def extract_project_info(path: str):
 
 
 def build_model_rows(path: str):
-    rows = load_proposal_page_rows(path)
-    rows = enrich_with_details(path, rows)
+    """
+    Parse a Project Schedule workbook into (buckets, project_info).
+    Re-parsing an unchanged file reuses the previous result; callers get their own copy.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    buckets, info = _build_model_rows_cached(path, st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(buckets), dict(info)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_model_rows_cached(path: str, mtime_ns: int, size: int):
+    _require_openpyxl()
+    # Parse each sheet once; the loaders below all read from these frames
+    with pd.ExcelFile(path, engine="openpyxl") as xl:
+        sheets = {name: xl.parse(name, header=None)
+                  for name in ("Proposal Page", "Civil", "Electrical")
+                  if name in xl.sheet_names}
+    if "Proposal Page" not in sheets:
+        raise ValueError("Worksheet named 'Proposal Page' not found")
+    rows = load_proposal_page_rows(sheets["Proposal Page"])
+    rows = enrich_with_details(sheets, rows)
+    info = extract_project_info(sheets["Proposal Page"])
 
     # Normalize phases
     for r in rows:
@@ -410,7 +436,6 @@ def build_model_rows(path: str):
         if cat in buckets and ph in buckets[cat]:
             buckets[cat][ph].append(r)
 
-    info = extract_project_info(path)
     return buckets, info
 
 
@@ -430,6 +455,38 @@ def build_model_rows(path: str):
     return buckets, info
 
 
+def _phase_durations_and_prices(tasks, hours_per_day, prefer_detail):
+    """
+    Vectorized per-task duration (whole days from hours) and price selection
+    for one phase bucket. Missing hours give 0 days; the preferred price
+    falls back to the other source when it is missing or zero.
+    """
+    n = len(tasks)
+    hours = np.zeros(n, dtype=np.float64)
+    pp = np.zeros(n, dtype=np.float64)
+    dp = np.zeros(n, dtype=np.float64)
+    for i, t in enumerate(tasks):
+        h = t.get("hours")
+        if h is not None:
+            hours[i] = h
+        v = t.get("proposal_price")
+        if v is not None:
+            pp[i] = v
+        v = t.get("detail_price")
+        if v is not None:
+            dp[i] = v
+
+    hours = np.nan_to_num(hours)
+    pp = np.nan_to_num(pp)
+    dp = np.nan_to_num(dp)
+    durations = np.ceil(hours / float(hours_per_day)).astype(np.int64)
+    if prefer_detail:
+        prices = np.where(dp != 0, dp, pp)
+    else:
+        prices = np.where(pp != 0, pp, dp)
+    return durations.tolist(), prices.tolist()
+
+
 def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, review_pairs: set):
     """
     Flatten into the table format ProposalGenerator expects:
@@ -441,6 +498,7 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
       - Project Closeout (top-level only)
     """
     rows_out = []
+    id_to_index = {}  # row ID -> position in rows_out
     next_id = 1
 
     # cross-category predecessor trackers
@@ -448,19 +506,20 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
     structural_first_task_applied = False
 
     def add_item(item_id, name, duration, price, is_milestone, indent, enabled, pred_id, lag, pinned, parent_id):
-        rows_out.append({
-            "ID": item_id,
-            "Name": name,
-            "Duration": int(duration or 0),
-            "Price": int(price or 0),
-            "Is Milestone": bool(is_milestone),
-            "Indent Level": int(indent),
-            "Enabled": bool(enabled),
-            "Predecessor ID": pred_id,
-            "Lag": int(lag or 0),
-            "Is Start Pinned": bool(pinned),
-            "Parent ID": parent_id,
-        })
+        rows_out.append(TemplateRow(
+            id=item_id,
+            name=name,
+            duration=int(duration or 0),
+            price=int(price or 0),
+            is_milestone=bool(is_milestone),
+            indent_level=int(indent),
+            enabled=bool(enabled),
+            predecessor_id=pred_id,
+            lag=int(lag or 0),
+            is_start_pinned=bool(pinned),
+            parent_id=parent_id,
+        ))
+        id_to_index[item_id] = len(rows_out) - 1
 
     # ---- Project Initiation ----
     pi_id = next_id; next_id += 1
@@ -487,16 +546,11 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
         # disabled until we actually add children
         add_item(cat_id, cat_label, 0, 0, True, 0, False, None, 0, False, None)
 
-        added_any = False
+        cat_map = buckets.get(cat_key, {})
+        if not any(cat_map.get(phase) for phase in PHASES):
+            return cat_id  # nothing priced: keep the disabled placeholder row only
 
-        def _price_of(t):
-            if cat_key == "Structural":
-                if price_source == "detail":
-                    return (t.get("detail_price") or t.get("proposal_price") or 0)
-                return (t.get("proposal_price") or t.get("detail_price") or 0)
-            if price_source == "detail":
-                return (t.get("detail_price") or t.get("proposal_price") or 0)
-            return (t.get("proposal_price") or t.get("detail_price") or 0)
+        added_any = False
 
         def _reorder_for_30(tasks, phase):
             if phase != "30%":
@@ -508,7 +562,7 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
         prev_phase_last_id = None
 
         for phase in PHASES:
-            raw = buckets.get(cat_key, {}).get(phase, [])
+            raw = cat_map.get(phase, [])
             if not raw:
                 continue
 
@@ -522,19 +576,15 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
             first_task_id = None
             last_task_id = None
 
-            for t in tasks:
-                # Duration: use hours if available (now extended to Substation & BESS)
-                if t.get("hours") is not None and cat_key in ("Civil", "Electrical", "Structural", "Substation", "BESS"):
-                    dur_days = math.ceil((t.get("hours") or 0) / float(hours_per_day))
-                else:
-                    dur_days = 0
+            durations, prices = _phase_durations_and_prices(tasks, hours_per_day, price_source == "detail")
 
+            for t, dur_days, price in zip(tasks, durations, prices):
                 tid = next_id; next_id += 1
                 add_item(
                     tid,
                     t["task"],
                     dur_days,
-                    _price_of(t),
+                    price,
                     False,
                     2,              # under phase milestone
                     True,
@@ -561,32 +611,29 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
 
             # Wire the first task's predecessor
             if first_task_id is not None:
-                idx = next(i for i in range(len(rows_out)) if rows_out[i]["ID"] == first_task_id)
+                idx = id_to_index[first_task_id]
                 if cat_key == "Structural" and (not structural_first_task_applied) and e60_first_task_id:
-                    rows_out[idx]["Predecessor ID"] = e60_first_task_id
+                    rows_out[idx].predecessor_id = e60_first_task_id
                     structural_first_task_applied = True
                 elif prev_phase_last_id is not None:
-                    rows_out[idx]["Predecessor ID"] = prev_phase_last_id
+                    rows_out[idx].predecessor_id = prev_phase_last_id
                 else:
                     # For first phase, tie to Due Diligence where applicable; otherwise last Project Initiation child
                     if phase == "30%":
                         if cat_key == "Civil" and civil_dd_id:
-                            rows_out[idx]["Predecessor ID"] = civil_dd_id
+                            rows_out[idx].predecessor_id = civil_dd_id
                         elif cat_key == "Electrical" and electrical_dd_id:
-                            rows_out[idx]["Predecessor ID"] = electrical_dd_id
+                            rows_out[idx].predecessor_id = electrical_dd_id
                         else:
-                            rows_out[idx]["Predecessor ID"] = last_pi_child
+                            rows_out[idx].predecessor_id = last_pi_child
                     else:
-                        rows_out[idx]["Predecessor ID"] = last_pi_child
+                        rows_out[idx].predecessor_id = last_pi_child
 
             prev_phase_last_id = last_task_id
 
         # enable the top-level only if we added content
         if added_any:
-            for i in range(len(rows_out) - 1, -1, -1):
-                if rows_out[i]["ID"] == cat_id:
-                    rows_out[i]["Enabled"] = True
-                    break
+            rows_out[id_to_index[cat_id]].enabled = True
 
         return cat_id
 
@@ -624,8 +671,21 @@ def flatten_to_template_rows(buckets, hours_per_day: float, price_source: str, r
 
 
 
-def push_into_generator(gen: ProposalGenerator, project_info, rows_out):
+def _parse_date_str(text):
+    """Parse a date string with the common formats first, then pandas."""
+    text = text.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return pd.to_datetime(text).to_pydatetime()
+
+
+def push_into_generator(gen: "ProposalGenerator", project_info, rows_out):
     """Replace any existing task tree with the new one and refresh the UI."""
+    from proposal_generator import ProposalItem
+
     # Try to clear any existing Treeview if present
     try:
         tree = getattr(gen, "tree", None) or getattr(gen, "treeview", None)
@@ -640,40 +700,40 @@ def push_into_generator(gen: ProposalGenerator, project_info, rows_out):
     gen.item_id_map = {}
     gen.task_counter = 0
 
-    # Rebuild from rows
+    # Rebuild from rows in one pass: flatten_to_template_rows always emits a
+    # parent before its children, so each parent is already built
     id_to_item = {}
-
-    def mk_item(row):
-        return ProposalItem(
-            name=row["Name"],
-            duration=int(row["Duration"] or 0),
-            price=int(row["Price"] or 0),
-            is_milestone=bool(row["Is Milestone"]),
-            indent_level=int(row["Indent Level"] or 0),
-            item_id=int(row["ID"]),
-        )
+    roots = []
+    max_id = 0
 
     for r in rows_out:
-        id_to_item[r["ID"]] = mk_item(r)
-
-    for r in rows_out:
-        item = id_to_item[r["ID"]]
-        pid = r["Parent ID"]
-        if pid:
-            parent = id_to_item.get(pid)
-            if parent:
-                item.parent = parent
-                parent.children.append(item)
-        pred = r["Predecessor ID"]
-        if pred:
-            item.predecessor_id = int(pred)
+        item = ProposalItem(
+            name=r.name,
+            duration=r.duration,
+            price=r.price,
+            is_milestone=r.is_milestone,
+            indent_level=r.indent_level,
+            item_id=r.id,
+            enabled=r.enabled,
+        )
+        id_to_item[r.id] = item
+        if max_id < r.id:
+            max_id = r.id
+
+        parent = id_to_item.get(r.parent_id) if r.parent_id else None
+        if parent:
+            item.parent = parent
+            parent.children.append(item)
+        else:
+            roots.append(item)
+        if r.predecessor_id:
+            item.predecessor_id = r.predecessor_id
             item.predecessor_type = 'FS'
-            item.lag = int(r.get("Lag") or 0)
-        item.enabled.set(bool(r["Enabled"]))
+            item.lag = r.lag
 
-    gen.template_items = [it for it in id_to_item.values() if it.parent is None]
-    gen.item_id_map = {it.id: it for it in id_to_item.values()}
-    gen.task_counter = max(gen.item_id_map.keys()) if gen.item_id_map else 0
+    gen.template_items = roots
+    gen.item_id_map = id_to_item
+    gen.task_counter = max_id
 
     # Project info
     if project_info.get("project"):
@@ -682,12 +742,11 @@ def push_into_generator(gen: ProposalGenerator, project_info, rows_out):
         gen.company_name.set(str(project_info["client"]))
     date_cell = project_info.get("date")
     try:
-        if isinstance(date_cell, (pd.Timestamp, datetime)):
-            dt = pd.to_datetime(date_cell).to_pydatetime()
-            gen.project_start_date.set(dt.strftime("%m/%d/%y"))
+        # pd.Timestamp subclasses datetime, so both format directly
+        if isinstance(date_cell, datetime):
+            gen.project_start_date.set(date_cell.strftime("%m/%d/%y"))
         elif isinstance(date_cell, str) and date_cell.strip():
-            dt = pd.to_datetime(date_cell)
-            gen.project_start_date.set(pd.to_datetime(dt).strftime("%m/%d/%y"))
+            gen.project_start_date.set(_parse_date_str(date_cell).strftime("%m/%d/%y"))
     except Exception:
         pass
 